@@ -0,0 +1,28 @@
+"""Índice cubriente (id) INCLUDE (nn_score)
+
+Permite que ScoringService.get_scores_dict resuelva los lookups
+id -> nn_score con un index-only scan.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+revision: str = '5c1e9a7d2b40'
+down_revision: Union[str, None] = 'a37e270efcc8'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Crear índice cubriente para lookups de score por id"""
+    op.create_index(
+        'idx_attraction_id_nn_score',
+        'attractions',
+        ['id'],
+        unique=False,
+        postgresql_include=['nn_score']
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('idx_attraction_id_nn_score', table_name='attractions')
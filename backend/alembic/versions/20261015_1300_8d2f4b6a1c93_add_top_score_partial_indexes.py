@@ -0,0 +1,38 @@
+"""Índices parciales para el top de atracciones por nn_score
+
+(destination_id, nn_score DESC) y (destination_id, category, nn_score DESC)
+sólo sobre filas con score: ScoringService.get_top_scored_attractions
+resuelve el ORDER BY ... LIMIT leyendo las primeras entradas del índice.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+revision: str = '8d2f4b6a1c93'
+down_revision: Union[str, None] = '5c1e9a7d2b40'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Crear índices parciales destino(+categoría) -> nn_score"""
+    op.create_index(
+        'idx_attraction_dest_top_score',
+        'attractions',
+        ['destination_id', sa.text('nn_score DESC')],
+        unique=False,
+        postgresql_where=sa.text('nn_score IS NOT NULL')
+    )
+    op.create_index(
+        'idx_attraction_dest_cat_top_score',
+        'attractions',
+        ['destination_id', 'category', sa.text('nn_score DESC')],
+        unique=False,
+        postgresql_where=sa.text('nn_score IS NOT NULL')
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('idx_attraction_dest_cat_top_score', table_name='attractions')
+    op.drop_index('idx_attraction_dest_top_score', table_name='attractions')
@@ -11,6 +11,7 @@ from geoalchemy2.elements import WKTElement  # type: ignore
 
 from shared.database.models import Attraction, Review, Destination
 from shared.utils.logger import setup_logger
+from shared.utils.geo import point_xy
 from shared.config.settings import settings
 
 from .google_places import GooglePlacesService
@@ -400,11 +401,9 @@ class DataAggregatorService:
     
     def _get_destination_coords(self, destination: Destination) -> Tuple[float, float]:
         """Obtener coordenadas del destino"""
-        from geoalchemy2.shape import to_shape
-        
         if destination.location:
-            point = to_shape(destination.location)
-            return point.y, point.x  # lat, lon
+            lon, lat = point_xy(destination.location)
+            return lat, lon
         
         raise ValueError(f"Destino {destination.id} sin ubicación")
     
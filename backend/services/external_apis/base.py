@@ -7,9 +7,10 @@ import hashlib
 import json
 from abc import ABC, abstractmethod
 from datetime import datetime, timedelta
-from typing import Any, Dict, Optional
-from functools import wraps
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+from functools import partial, wraps
 import httpx
+import ijson
 
 from shared.utils.logger import setup_logger
 
@@ -45,11 +46,11 @@ class RateLimiter:
             
             # Verificar límites
             if len(self.minute_calls) >= self.calls_per_minute:
-                logger.warning(f"Rate limit por minuto alcanzado: {len(self.minute_calls)}/{self.calls_per_minute}")
+                logger.warning("Rate limit por minuto alcanzado: %d/%d", len(self.minute_calls), self.calls_per_minute)
                 return False
             
             if len(self.day_calls) >= self.calls_per_day:
-                logger.warning(f"Rate limit diario alcanzado: {len(self.day_calls)}/{self.calls_per_day}")
+                logger.warning("Rate limit diario alcanzado: %d/%d", len(self.day_calls), self.calls_per_day)
                 return False
             
             # Registrar llamada
@@ -84,7 +85,7 @@ class InMemoryCache:
             if key in self.cache:
                 entry = self.cache[key]
                 if datetime.now() < entry['expires_at']:
-                    logger.debug(f"Cache HIT: {key[:16]}...")
+                    logger.debug("Cache HIT: %.16s...", key)
                     return entry['value']
                 else:
                     # Expirado, eliminar
@@ -99,7 +100,7 @@ class InMemoryCache:
                 'value': value,
                 'expires_at': datetime.now() + timedelta(seconds=ttl)
             }
-            logger.debug(f"Cache SET: {key[:16]}... (TTL: {ttl}s)")
+            logger.debug("Cache SET: %.16s... (TTL: %ss)", key, ttl)
     
     async def clear_expired(self) -> int:
         """Limpiar entradas expiradas"""
@@ -115,12 +116,30 @@ class InMemoryCache:
         return len(self.cache)
 
 
+class _AsyncResponseReader:
+    """
+    Adaptador de una respuesta httpx en streaming a objeto tipo archivo async
+    (interfaz `read()` que espera ijson)
+    """
+    def __init__(self, response: httpx.Response):
+        self._chunks = response.aiter_bytes()
+    
+    async def read(self, size: int = -1) -> bytes:
+        try:
+            return await self._chunks.__anext__()
+        except StopAsyncIteration:
+            return b""
+
+
 class BaseExternalAPI(ABC):
     """
     Clase base abstracta para servicios de APIs externas
     Incluye rate limiting, caché y manejo de errores
     """
     
+    # Tamaño a partir del cual conviene parsear la respuesta en streaming
+    STREAMING_THRESHOLD_BYTES = 50 * 1024
+    
     def __init__(
         self, 
         api_key: str,
@@ -128,7 +147,8 @@ class BaseExternalAPI(ABC):
         calls_per_minute: int = 60,
         calls_per_day: int = 1000,
         cache_ttl_seconds: int = 3600,
-        timeout_seconds: int = 30
+        timeout_seconds: int = 30,
+        default_params: Optional[Dict[str, Any]] = None
     ):
         self.api_key = api_key
         self.base_url = base_url
@@ -140,8 +160,11 @@ class BaseExternalAPI(ABC):
         # Caché compartido
         self.cache = InMemoryCache(cache_ttl_seconds)
         
-        # Cliente HTTP async
-        self.client = httpx.AsyncClient(timeout=timeout_seconds)
+        # Requests en vuelo por cache key (single-flight)
+        self._inflight: Dict[str, asyncio.Future] = {}
+        
+        # Cliente HTTP async (params invariantes como API key/idioma se envían en cada request)
+        self.client = httpx.AsyncClient(timeout=timeout_seconds, params=default_params)
     
     @abstractmethod
     async def search_places(self, query: str, lat: float, lon: float, radius_meters: int) -> list:
@@ -153,6 +176,30 @@ class BaseExternalAPI(ABC):
         """Obtener detalles de un lugar"""
         pass
     
+    async def _coalesce(self, key: str, fetch: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        Ejecutar `fetch` una sola vez por key aunque lleguen llamadas concurrentes
+        
+        El request corre en su propia task y todas las llamadas (también la
+        primera) la esperan con shield: obtienen el mismo resultado (o la
+        misma excepción) y cancelar a una no cancela el request compartido.
+        Evita la estampida hacia la API cuando expira una entrada de caché.
+        """
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(fetch())
+            self._inflight[key] = task
+            task.add_done_callback(partial(self._inflight_done, key))
+        return await asyncio.shield(task)
+    
+    def _inflight_done(self, key: str, task: asyncio.Future) -> None:
+        """Quitar el request terminado de `_inflight`"""
+        if self._inflight.get(key) is task:
+            del self._inflight[key]
+        # Marcar la excepción como recuperada aunque todos los waiters se cancelaran
+        if not task.cancelled():
+            task.exception()
+    
     async def _make_request(
         self, 
         method: str, 
@@ -173,10 +220,10 @@ class BaseExternalAPI(ABC):
             if cached is not None:
                 return cached
         
-        # Esperar si hay rate limiting
-        await self.rate_limiter.wait_if_needed()
-        
-        try:
+        async def fetch() -> Dict[str, Any]:
+            # Esperar si hay rate limiting
+            await self.rate_limiter.wait_if_needed()
+            
             if method.upper() == "GET":
                 response = await self.client.get(url, params=params)
             elif method.upper() == "POST":
@@ -192,12 +239,74 @@ class BaseExternalAPI(ABC):
                 await self.cache.set(cache_key, data, cache_ttl)
             
             return data
+        
+        try:
+            return await self._coalesce(cache_key, fetch)
+            
+        except httpx.HTTPStatusError as e:
+            logger.error("Error HTTP %d: %s", e.response.status_code, e.response.text)
+            raise
+        except httpx.RequestError as e:
+            logger.error("Error de conexión: %s", e)
+            raise
+    
+    async def _make_streaming_request(
+        self,
+        endpoint: str,
+        params: Optional[Dict],
+        items_key: str,
+        parse_item: Callable[[Dict], Any],
+        use_cache: bool = True,
+        cache_ttl: Optional[int] = None
+    ) -> List[Any]:
+        """
+        Realizar GET parseando incrementalmente la lista `items_key` del JSON
+        
+        Cada elemento se convierte con `parse_item` conforme llega, sin
+        materializar el árbol completo de la respuesta. Si el payload es
+        pequeño (< STREAMING_THRESHOLD_BYTES) se usa el parser normal.
+        Se cachea la lista ya parseada.
+        """
+        url = f"{self.base_url}/{endpoint}"
+        cache_key = self.cache._make_key("GET", url, params, items_key)
+        
+        if use_cache:
+            cached = await self.cache.get(cache_key)
+            if cached is not None:
+                return cached
+        
+        async def fetch() -> List[Any]:
+            await self.rate_limiter.wait_if_needed()
+            
+            async with self.client.stream("GET", url, params=params) as response:
+                if response.is_error:
+                    await response.aread()
+                response.raise_for_status()
+                
+                content_length = int(response.headers.get("content-length") or 0)
+                if 0 < content_length < self.STREAMING_THRESHOLD_BYTES:
+                    data = json.loads(await response.aread())
+                    items = [parse_item(item) for item in data.get(items_key, [])]
+                else:
+                    reader = _AsyncResponseReader(response)
+                    items = [
+                        parse_item(item)
+                        async for item in ijson.items_async(reader, f"{items_key}.item", use_float=True)
+                    ]
+            
+            if use_cache:
+                await self.cache.set(cache_key, items, cache_ttl)
+            
+            return items
+        
+        try:
+            return await self._coalesce(cache_key, fetch)
             
         except httpx.HTTPStatusError as e:
-            logger.error(f"Error HTTP {e.response.status_code}: {e.response.text}")
+            logger.error("Error HTTP %d: %s", e.response.status_code, e.response.text)
             raise
         except httpx.RequestError as e:
-            logger.error(f"Error de conexión: {str(e)}")
+            logger.error("Error de conexión: %s", e)
             raise
     
     async def close(self):
@@ -2,6 +2,7 @@
 """
 Servicio de integración con Foursquare Places API
 """
+from types import MappingProxyType
 from typing import List, Dict, Optional, Any
 from .base import BaseExternalAPI
 from shared.utils.logger import setup_logger
@@ -9,6 +10,12 @@ from shared.config.settings import settings
 
 logger = setup_logger(__name__)
 
+# Días en español indexados por el `day` de Foursquare (1 = lunes ... 7 = domingo)
+_DAYS_ES_FS = (None, "lunes", "martes", "miercoles", "jueves", "viernes", "sabado", "domingo")
+
+# Default compartido (solo lectura) para accesos anidados: evita crear un {} por campo
+_EMPTY = MappingProxyType({})
+
 
 class FoursquareService(BaseExternalAPI):
     """
@@ -89,12 +96,12 @@ class FoursquareService(BaseExternalAPI):
             )
             
             results = data.get("results", [])
-            logger.info(f"Foursquare: {len(results)} resultados para '{query}'")
+            logger.info("Foursquare: %d resultados para %r", len(results), query)
             
             return [self._parse_place(place) for place in results]
             
         except Exception as e:
-            logger.error(f"Error en búsqueda Foursquare: {str(e)}")
+            logger.error("Error en búsqueda Foursquare: %s", e, exc_info=True)
             return []
     
     async def get_place_details(self, fsq_id: str) -> Dict[str, Any]:
@@ -119,7 +126,7 @@ class FoursquareService(BaseExternalAPI):
             return self._parse_place_details(data)
             
         except Exception as e:
-            logger.error(f"Error obteniendo detalles Foursquare: {str(e)}")
+            logger.error("Error obteniendo detalles Foursquare: %s", e, exc_info=True)
             return {}
     
     async def get_place_tips(self, fsq_id: str, limit: int = 10) -> List[Dict]:
@@ -146,7 +153,7 @@ class FoursquareService(BaseExternalAPI):
             ]
             
         except Exception as e:
-            logger.error(f"Error obteniendo tips: {str(e)}")
+            logger.error("Error obteniendo tips: %s", e, exc_info=True)
             return []
     
     async def get_popularity_data(self, fsq_id: str) -> Dict[str, Any]:
@@ -165,9 +172,10 @@ class FoursquareService(BaseExternalAPI):
     
     def _parse_place(self, place: Dict) -> Dict[str, Any]:
         """Convertir respuesta de Foursquare a formato interno"""
-        geocodes = place.get("geocodes", {}).get("main", {})
-        location = place.get("location", {})
-        categories = place.get("categories", [])
+        get = place.get
+        geocodes = get("geocodes", _EMPTY).get("main", _EMPTY)
+        categories = get("categories") or ()
+        chains = get("chains")
         
         # Obtener categoría principal
         main_category = None
@@ -177,15 +185,15 @@ class FoursquareService(BaseExternalAPI):
         
         return {
             "source": "foursquare",
-            "source_id": place.get("fsq_id"),
-            "name": place.get("name"),
-            "address": location.get("formatted_address"),
+            "source_id": get("fsq_id"),
+            "name": get("name"),
+            "address": get("location", _EMPTY).get("formatted_address"),
             "lat": geocodes.get("latitude"),
             "lon": geocodes.get("longitude"),
             "category": main_category,
             "categories_raw": [c.get("name") for c in categories],
-            "distance_meters": place.get("distance"),
-            "chain_id": place.get("chains", [{}])[0].get("id") if place.get("chains") else None
+            "distance_meters": get("distance"),
+            "chain_id": chains[0].get("id") if chains else None
         }
     
     def _parse_place_details(self, place: Dict) -> Dict[str, Any]:
@@ -213,16 +221,11 @@ class FoursquareService(BaseExternalAPI):
         if not hours_data:
             return {}
         
-        day_map = {
-            1: "lunes", 2: "martes", 3: "miercoles",
-            4: "jueves", 5: "viernes", 6: "sabado", 7: "domingo"
-        }
-        
         parsed = {}
         for period in hours_data.get("regular", []):
             day = period.get("day")
-            if day in day_map:
-                parsed[day_map[day]] = {
+            if isinstance(day, int) and 1 <= day <= 7:
+                parsed[_DAYS_ES_FS[day]] = {
                     "open": period.get("open"),
                     "close": period.get("close")
                 }
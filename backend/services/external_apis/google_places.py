@@ -2,6 +2,7 @@
 """
 Servicio de integración con Google Places API
 """
+from types import MappingProxyType
 from typing import List, Dict, Optional, Any
 from .base import BaseExternalAPI
 from shared.utils.logger import setup_logger
@@ -9,6 +10,12 @@ from shared.config.settings import settings
 
 logger = setup_logger(__name__)
 
+# Días en español indexados por el `day` de Google (0 = domingo)
+_DAYS_ES_GP = ("domingo", "lunes", "martes", "miercoles", "jueves", "viernes", "sabado")
+
+# Default compartido (solo lectura) para accesos anidados: evita crear un {} por campo
+_EMPTY = MappingProxyType({})
+
 
 class GooglePlacesService(BaseExternalAPI):
     """
@@ -23,14 +30,22 @@ class GooglePlacesService(BaseExternalAPI):
     Estrategia: Usar caché agresivo (24h) para datos estáticos
     """
     
+    # Plantilla de URL de fotos (se formatea sólo cuando se solicita la URL)
+    _PHOTO_URL_TPL = (
+        "https://maps.googleapis.com/maps/api/place/photo"
+        "?maxwidth={w}&photo_reference={r}&key={k}"
+    )
+    
     def __init__(self, api_key: Optional[str] = None):
+        api_key = api_key or settings.GOOGLE_PLACES_API_KEY
         super().__init__(
-            api_key=api_key or settings.GOOGLE_PLACES_API_KEY,
+            api_key=api_key,
             base_url="https://maps.googleapis.com/maps/api/place",
             calls_per_minute=50,      # Conservador
             calls_per_day=500,        # ~$8.50/día máximo
             cache_ttl_seconds=86400,  # 24 horas (datos no cambian mucho)
-            timeout_seconds=15
+            timeout_seconds=15,
+            default_params={"key": api_key, "language": "es"}
         )
     
     async def search_places(
@@ -57,29 +72,27 @@ class GooglePlacesService(BaseExternalAPI):
         params = {
             "query": query,
             "location": f"{lat},{lon}",
-            "radius": min(radius_meters, 50000),
-            "key": self.api_key,
-            "language": "es"
+            "radius": min(radius_meters, 50000)
         }
         
         if place_type:
             params["type"] = place_type
         
         try:
-            data = await self._make_request(
-                "GET", 
-                "textsearch/json", 
+            # textsearch puede devolver cientos de KB: parseo en streaming
+            results = await self._make_streaming_request(
+                "textsearch/json",
                 params,
+                items_key="results",
+                parse_item=self._parse_place,
                 cache_ttl=86400  # 24 horas
             )
+            logger.info("Google Places: %d resultados para %r", len(results), query)
             
-            results = data.get("results", [])
-            logger.info(f"Google Places: {len(results)} resultados para '{query}'")
-            
-            return [self._parse_place(place) for place in results]
+            return results
             
         except Exception as e:
-            logger.error(f"Error en búsqueda Google Places: {str(e)}")
+            logger.error("Error en búsqueda Google Places: %s", e, exc_info=True)
             return []
     
     async def search_nearby(
@@ -95,24 +108,20 @@ class GooglePlacesService(BaseExternalAPI):
         params = {
             "location": f"{lat},{lon}",
             "radius": min(radius_meters, 50000),
-            "type": place_type,
-            "key": self.api_key,
-            "language": "es"
+            "type": place_type
         }
         
         try:
-            data = await self._make_request(
-                "GET",
+            return await self._make_streaming_request(
                 "nearbysearch/json",
                 params,
+                items_key="results",
+                parse_item=self._parse_place,
                 cache_ttl=86400
             )
             
-            results = data.get("results", [])
-            return [self._parse_place(place) for place in results]
-            
         except Exception as e:
-            logger.error(f"Error en nearby search: {str(e)}")
+            logger.error("Error en nearby search: %s", e, exc_info=True)
             return []
     
     async def get_place_details(
@@ -140,9 +149,7 @@ class GooglePlacesService(BaseExternalAPI):
         
         params = {
             "place_id": place_id,
-            "fields": ",".join(fields or default_fields),
-            "key": self.api_key,
-            "language": "es"
+            "fields": ",".join(fields or default_fields)
         }
         
         try:
@@ -157,7 +164,7 @@ class GooglePlacesService(BaseExternalAPI):
             return self._parse_place_details(result)
             
         except Exception as e:
-            logger.error(f"Error obteniendo detalles: {str(e)}")
+            logger.error("Error obteniendo detalles: %s", e, exc_info=True)
             return {}
     
     async def get_place_reviews(self, place_id: str, max_reviews: int = 5) -> List[Dict]:
@@ -171,22 +178,23 @@ class GooglePlacesService(BaseExternalAPI):
     
     def _parse_place(self, place: Dict) -> Dict[str, Any]:
         """Convertir respuesta de Google Places a formato interno"""
-        geometry = place.get("geometry", {})
-        location = geometry.get("location", {})
+        get = place.get
+        location = get("geometry", _EMPTY).get("location", _EMPTY)
+        photos = get("photos")
         
         return {
             "source": "google_places",
-            "source_id": place.get("place_id"),
-            "name": place.get("name"),
-            "address": place.get("formatted_address"),
+            "source_id": get("place_id"),
+            "name": get("name"),
+            "address": get("formatted_address"),
             "lat": location.get("lat"),
             "lon": location.get("lng"),
-            "rating": place.get("rating"),
-            "total_reviews": place.get("user_ratings_total", 0),
-            "price_level": place.get("price_level"),  # 0-4
-            "types": place.get("types", []),
-            "is_open": place.get("opening_hours", {}).get("open_now"),
-            "photo_reference": self._get_photo_reference(place)
+            "rating": get("rating"),
+            "total_reviews": get("user_ratings_total", 0),
+            "price_level": get("price_level"),  # 0-4
+            "types": get("types", []),
+            "is_open": get("opening_hours", _EMPTY).get("open_now"),
+            "photo_reference": photos[0].get("photo_reference") if photos else None
         }
     
     def _parse_place_details(self, place: Dict) -> Dict[str, Any]:
@@ -208,24 +216,16 @@ class GooglePlacesService(BaseExternalAPI):
         if not hours_data:
             return {}
         
-        weekday_text = hours_data.get("weekday_text", [])
         periods = hours_data.get("periods", [])
         
-        # Mapear días en español
-        day_map = {
-            0: "domingo", 1: "lunes", 2: "martes", 3: "miercoles",
-            4: "jueves", 5: "viernes", 6: "sabado"
-        }
-        
         parsed = {}
         for period in periods:
             open_info = period.get("open", {})
             close_info = period.get("close", {})
             day = open_info.get("day")
             
-            if day is not None and day in day_map:
-                day_name = day_map[day]
-                parsed[day_name] = {
+            if isinstance(day, int) and 0 <= day < 7:
+                parsed[_DAYS_ES_GP[day]] = {
                     "open": open_info.get("time", "00:00"),
                     "close": close_info.get("time", "23:59") if close_info else "23:59"
                 }
@@ -245,18 +245,8 @@ class GooglePlacesService(BaseExternalAPI):
             for r in reviews
         ]
     
-    def _get_photo_reference(self, place: Dict) -> Optional[str]:
-        """Obtener referencia de foto principal"""
-        photos = place.get("photos", [])
-        if photos:
-            return photos[0].get("photo_reference")
-        return None
-    
     def get_photo_url(self, photo_reference: str, max_width: int = 400) -> str:
         """Generar URL de foto"""
-        return (
-            f"https://maps.googleapis.com/maps/api/place/photo"
-            f"?maxwidth={max_width}"
-            f"&photo_reference={photo_reference}"
-            f"&key={self.api_key}"
+        return self._PHOTO_URL_TPL.format_map(
+            {"w": max_width, "r": photo_reference, "k": self.api_key}
         )
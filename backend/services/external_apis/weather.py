@@ -2,6 +2,8 @@
 """
 Servicio de integración con OpenWeatherMap API
 """
+import time
+from functools import lru_cache
 from typing import Dict, Optional, Any, List
 from datetime import datetime
 from .base import BaseExternalAPI
@@ -11,6 +13,16 @@ from shared.config.settings import settings
 logger = setup_logger(__name__)
 
 
+@lru_cache(maxsize=1)
+def _datetime_at(second: int) -> datetime:
+    return datetime.fromtimestamp(second)
+
+
+def _now_cached() -> datetime:
+    """Hora actual con resolución de 1 segundo (reutiliza el mismo datetime)"""
+    return _datetime_at(int(time.time()))
+
+
 class WeatherService(BaseExternalAPI):
     """
     Cliente para OpenWeatherMap API
@@ -37,13 +49,19 @@ class WeatherService(BaseExternalAPI):
     }
     
     def __init__(self, api_key: Optional[str] = None):
+        api_key = api_key or settings.OPENWEATHER_API_KEY
         super().__init__(
-            api_key=api_key or settings.OPENWEATHER_API_KEY,
+            api_key=api_key,
             base_url="https://api.openweathermap.org/data/2.5",
             calls_per_minute=55,
             calls_per_day=900,
             cache_ttl_seconds=1800,  # 30 minutos (clima cambia)
-            timeout_seconds=10
+            timeout_seconds=10,
+            default_params={
+                "appid": api_key,
+                "units": "metric",
+                "lang": "es"
+            }
         )
     
     async def search_places(self, query: str, lat: float, lon: float, radius_meters: int) -> list:
@@ -71,10 +89,7 @@ class WeatherService(BaseExternalAPI):
         """
         params = {
             "lat": lat,
-            "lon": lon,
-            "appid": self.api_key,
-            "units": "metric",
-            "lang": "es"
+            "lon": lon
         }
         
         try:
@@ -88,7 +103,7 @@ class WeatherService(BaseExternalAPI):
             return self._parse_current_weather(data)
             
         except Exception as e:
-            logger.error(f"Error obteniendo clima: {str(e)}")
+            logger.error("Error obteniendo clima: %s", e, exc_info=True)
             return self._get_default_weather()
     
     async def get_forecast(
@@ -103,9 +118,6 @@ class WeatherService(BaseExternalAPI):
         params = {
             "lat": lat,
             "lon": lon,
-            "appid": self.api_key,
-            "units": "metric",
-            "lang": "es",
             "cnt": min(days * 8, 40)  # 8 datos por día (cada 3 horas)
         }
         
@@ -121,7 +133,7 @@ class WeatherService(BaseExternalAPI):
             return [self._parse_forecast_item(item) for item in forecasts]
             
         except Exception as e:
-            logger.error(f"Error obteniendo pronóstico: {str(e)}")
+            logger.error("Error obteniendo pronóstico: %s", e, exc_info=True)
             return []
     
     async def get_weather_for_date(
@@ -174,7 +186,7 @@ class WeatherService(BaseExternalAPI):
             "visibility_meters": data.get("visibility"),
             "sunrise": datetime.fromtimestamp(data.get("sys", {}).get("sunrise", 0)),
             "sunset": datetime.fromtimestamp(data.get("sys", {}).get("sunset", 0)),
-            "timestamp": datetime.now(),
+            "timestamp": _now_cached(),
             "is_outdoor_friendly": self._is_outdoor_friendly(condition_raw, main)
         }
     
@@ -219,7 +231,7 @@ class WeatherService(BaseExternalAPI):
             "humidity": 50,
             "wind_speed_kmh": 10,
             "is_outdoor_friendly": True,
-            "timestamp": datetime.now(),
+            "timestamp": _now_cached(),
             "is_default": True
         }
     
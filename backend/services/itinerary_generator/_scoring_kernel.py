@@ -0,0 +1,75 @@
+# backend/services/itinerary_generator/_scoring_kernel.py
+"""
+Kernel numérico del scoring de candidatos
+
+Con numba instalado el score se calcula en un único bucle compilado
+(sin arrays temporales); sin numba se usa la versión vectorizada NumPy.
+"""
+import numpy as np
+
+from shared.config.constants import SCORING_WEIGHTS
+
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:  # numba es opcional
+    NUMBA_AVAILABLE = False
+
+
+# Orden fijo de los pesos que recibe el kernel
+SCORE_WEIGHTS = np.array([
+    SCORING_WEIGHTS.get('nn_score_weight', 25.0),
+    SCORING_WEIGHTS['rating_multiplier'],
+    SCORING_WEIGHTS['foursquare_rating_multiplier'],
+    SCORING_WEIGHTS['foursquare_popularity_multiplier'],
+    SCORING_WEIGHTS['foursquare_checkins_bonus'],
+    SCORING_WEIGHTS['price_mismatch'],
+    SCORING_WEIGHTS['missing_amenity'],
+    SCORING_WEIGHTS['rating_below_min'],
+    SCORING_WEIGHTS['distance_penalty_per_km'],
+], dtype=np.float64)
+
+
+def _score_numpy(nn_scores, ratings, fsq_ratings, fsq_popularity, fsq_checkins,
+                 cat_ids, price_bad, missing, dists, cat_bonus, weights, min_rating):
+    return (
+        nn_scores * weights[0]
+        + ratings * weights[1]
+        + np.where(fsq_ratings > 0, fsq_ratings, 0.0) * weights[2]
+        + np.where(fsq_popularity > 0, fsq_popularity, 0.0) * weights[3]
+        + np.where(fsq_checkins > 0, fsq_checkins, 0.0) * weights[4]
+        + cat_bonus[cat_ids]
+        + price_bad * weights[5]
+        + missing * weights[6]
+        + (ratings < min_rating) * weights[7]
+        - (dists / 1000.0) * weights[8]
+    )
+
+
+if NUMBA_AVAILABLE:
+    @njit(cache=True, fastmath=True)
+    def _score_jit(nn_scores, ratings, fsq_ratings, fsq_popularity, fsq_checkins,
+                   cat_ids, price_bad, missing, dists, cat_bonus, weights, min_rating):
+        n = nn_scores.shape[0]
+        out = np.empty(n, dtype=np.float64)
+        for i in range(n):
+            score = nn_scores[i] * weights[0] + ratings[i] * weights[1]
+            if fsq_ratings[i] > 0:
+                score += fsq_ratings[i] * weights[2]
+            if fsq_popularity[i] > 0:
+                score += fsq_popularity[i] * weights[3]
+            if fsq_checkins[i] > 0:
+                score += fsq_checkins[i] * weights[4]
+            score += cat_bonus[cat_ids[i]]
+            if price_bad[i]:
+                score += weights[5]
+            score += missing[i] * weights[6]
+            if ratings[i] < min_rating:
+                score += weights[7]
+            score -= (dists[i] / 1000.0) * weights[8]
+            out[i] = score
+        return out
+
+    score_kernel = _score_jit
+else:
+    score_kernel = _score_numpy
@@ -1,11 +1,13 @@
 # backend/services/itinerary_generator/clustering.py
 """
 Algoritmos de agrupación (Clustering) para dividir atracciones en días
+
+Las coordenadas llegan ya decodificadas en `location_coords`; para leer
+un POINT desde WKB usar `shared.utils.geo.point_xy` (no Shapely).
 """
 from typing import List, Dict, Tuple
 import math
 import random
-from geoalchemy2.shape import to_shape # type: ignore
 from shared.utils.logger import setup_logger
 
 logger = setup_logger(__name__)
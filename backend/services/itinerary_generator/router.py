@@ -5,6 +5,7 @@ Integra OpenWeather para clima real y Foursquare para scoring
 """
 from typing import Optional
 from fastapi import APIRouter, Depends, HTTPException, status, Path, Query
+from fastapi.responses import ORJSONResponse
 from sqlalchemy.orm import Session
 
 from shared.database.base import get_db
@@ -23,20 +24,26 @@ logger = setup_logger(__name__)
 
 router = APIRouter(
     prefix="/itinerary",
-    tags=["Itinerary Generator"]
+    tags=["Itinerary Generator"],
+    default_response_class=ORJSONResponse
 )
 
 
+def get_itinerary_service(db: Session = Depends(get_db)) -> ItineraryGeneratorService:
+    """Dependency: fachada ligera del generador ligada a la sesión del request"""
+    return ItineraryGeneratorService(db)
+
+
 @router.post(
     "/generate",
-    response_model=dict,
     status_code=status.HTTP_201_CREATED,
     summary="Generar itinerario completo",
     description="Genera un itinerario multi-día y lo guarda en BD"
 )
 async def generate_itinerary(
     request: ItineraryGenerationRequest,
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_db),
+    service: ItineraryGeneratorService = Depends(get_itinerary_service)
 ):
     """
     Genera un itinerario optimizado multi-día
@@ -50,8 +57,6 @@ async def generate_itinerary(
     6. Guardado en BD
     """
     try:
-        service = ItineraryGeneratorService(db)
-        
         # Extraer destination_id del city_center
         from shared.database.models import Attraction
         center_attr = db.query(Attraction). filter(Attraction.id == request.city_center_id).first()
@@ -75,8 +80,9 @@ async def generate_itinerary(
         
         if "error" in result:
             raise HTTPException(status_code=404, detail=result["error"])
-            
-        return result
+        
+        # Respuesta directa: orjson serializa el dict sin pasar por jsonable_encoder
+        return ORJSONResponse(content=result, status_code=status.HTTP_201_CREATED)
 
     except HTTPException:
         raise
@@ -1,25 +1,89 @@
 # backend/services/itinerary_generator/service.py
-from typing import List, Dict, Optional
+import asyncio
+import heapq
+from collections import OrderedDict
+from functools import partial
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Dict, Optional, Tuple
 from datetime import datetime, timedelta, date
+import numpy as np
+from sqlalchemy import insert, event, inspect
 from sqlalchemy.orm import Session
-from geoalchemy2.shape import to_shape # type: ignore
+from fastapi import HTTPException, status
+from psycopg2.extras import execute_values
 
-from shared.database.models import UserProfile, Attraction, Itinerary, ItineraryAttraction, ItineraryDay, Destination
+from shared.database import SessionLocal, engine
+from shared.database.models import UserProfile, Itinerary, ItineraryAttraction, ItineraryDay, Destination
 from shared.config.constants import SCORING_WEIGHTS, DEFAULT_VISIT_DURATION
 from shared.config.settings import get_settings
+from shared.graph_loader import GraphDataManager
 from services.search_service import SearchService
 from services.route_optimizer import RouterOptimizerService
 from services.rules_engine import RulesEngineService
 from .clustering import DayClustering
+from ._scoring_kernel import score_kernel, SCORE_WEIGHTS
 from shared.utils.logger import setup_logger
 
 logger = setup_logger(__name__)
 
+# ═══════════════════════════════════════════════════════════
+# CACHÉ DE PERFILES ENRIQUECIDOS (Rules Engine)
+# Key: (profile_id, fecha, hora, clima, temperatura, epoch)
+# ═══════════════════════════════════════════════════════════
+ENRICH_CACHE_MAX_SIZE = 512
+_enrich_cache: "OrderedDict[Tuple, Dict]" = OrderedDict()
+_enrich_cache_epoch = 0
+
+# Campos del perfil que alimentan las reglas (computed_profile es la salida)
+_PROFILE_RULE_INPUTS = (
+    'name', 'preferences', 'budget_range', 'budget_min', 'budget_max', 'mobility_constraints'
+)
+
+
+@event.listens_for(UserProfile, "after_update")
+def _invalidate_enrich_cache(mapper, connection, target):
+    """Invalidar la caché cuando cambia algún dato de entrada de las reglas"""
+    global _enrich_cache_epoch
+    attrs = inspect(target).attrs
+    if any(attrs[name].history.has_changes() for name in _PROFILE_RULE_INPUTS):
+        _enrich_cache_epoch += 1
+        _enrich_cache.clear()
+
+
+@event.listens_for(UserProfile, "after_delete")
+def _drop_deleted_profile(mapper, connection, target):
+    """Olvidar las entradas de un perfil borrado"""
+    for key in [key for key in _enrich_cache if key[0] == target.id]:
+        del _enrich_cache[key]
+
+
+# ═══════════════════════════════════════════════════════════
+# HILOS DE RUTEO (A* + TSP por día)
+# Un único pool por proceso: cada hilo abre su propia sesión, así que el
+# total de conexiones de ruteo queda acotado a la mitad del pool del engine
+# (la otra mitad queda para las sesiones de los requests)
+# ═══════════════════════════════════════════════════════════
+ROUTING_MAX_WORKERS = max(1, engine.pool.size() // 2)
+_routing_executor = ThreadPoolExecutor(
+    max_workers=ROUTING_MAX_WORKERS,
+    thread_name_prefix="itinerary-routing"
+)
+
+
 class ItineraryGeneratorService:
+    # Servicios sin estado: se comparten entre requests en vez de crearse por instancia
+    search_service = SearchService()
+    optimizer_service = RouterOptimizerService()
+    
+    # Filas en itinerary_attractions además de ItineraryDay.day_data.
+    # Ningún endpoint las lee hoy; en False se evita un INSERT por atracción
+    PERSIST_ATTRACTION_JOIN_ROWS = True
+    
+    # A partir de este número de filas se inserta con execute_values (psycopg2)
+    EXECUTE_VALUES_MIN_ROWS = 200
+
     def __init__(self, db: Session):
         self.db = db
-        self.search_service = SearchService()
-        self.optimizer_service = RouterOptimizerService()
 
     async def _get_weather_context(self, destination_id: int) -> Dict:
         """Obtener clima real usando OpenWeather si está configurado"""
@@ -49,6 +113,60 @@ class ItineraryGeneratorService:
             logger.warning(f"Error obteniendo clima: {e}, usando valores por defecto")
             return {"condition": "sunny", "temperature": 24}
 
+    def _enrich_profile_cached(self, user_profile_id: int, context: Dict) -> Dict:
+        """
+        Enriquecer el perfil reutilizando el resultado si ya se calculó
+        para el mismo contexto (fecha, hora y clima).
+        """
+        current_date = context['current_date']
+        weather = context.get('weather') or {}
+        key = (
+            user_profile_id,
+            current_date.date(),
+            context['current_time'].hour,
+            weather.get('condition'),
+            weather.get('temperature'),
+            _enrich_cache_epoch
+        )
+        
+        cached = _enrich_cache.get(key)
+        if cached is not None:
+            # Igual que enrich_user_profile: computed_profile queda con el
+            # contexto de este itinerario. El UPDATE también confirma que el
+            # perfil sigue existiendo (pudo borrarse desde otro proceso)
+            updated = self.db.query(UserProfile).filter(
+                UserProfile.id == user_profile_id
+            ).update(
+                {UserProfile.computed_profile: cached['computed_profile']},
+                synchronize_session=False
+            )
+            if not updated:
+                _enrich_cache.pop(key, None)
+                raise HTTPException(
+                    status_code=status.HTTP_404_NOT_FOUND,
+                    detail=f"Perfil de usuario {user_profile_id} no encontrado"
+                )
+            self.db.commit()
+            
+            _enrich_cache.move_to_end(key)
+            logger.debug(f"Perfil {user_profile_id} enriquecido desde caché")
+            return cached
+        
+        result = RulesEngineService.enrich_user_profile(
+            db=self.db,
+            user_profile_id=user_profile_id,
+            context=context
+        )
+        
+        # El scorer del perfil se cachea junto con el perfil enriquecido
+        result['scorer'] = self._build_profile_scorer(result['computed_profile'])
+        
+        _enrich_cache[key] = result
+        if len(_enrich_cache) > ENRICH_CACHE_MAX_SIZE:
+            _enrich_cache.popitem(last=False)
+        
+        return result
+
     async def generate_itinerary(
         self, 
         user_profile_id: int, 
@@ -64,21 +182,24 @@ class ItineraryGeneratorService:
         
         logger.info(f"🚀 Generando itinerario de {num_days} días para perfil {user_profile_id}")
         
+        # Asegurar que start_date es datetime y derivar fechas una sola vez
+        if isinstance(start_date, str):
+            start_date = datetime.fromisoformat(start_date.replace('Z', '+00:00'))
+        start_day = start_date.date()
+        start_time = start_date.time()
+        end_day = start_day + timedelta(days=num_days - 1)
+        
         # 1. Obtener clima real de OpenWeather
         weather = await self._get_weather_context(destination_id)
         
         # 2. Enriquecer Perfil con contexto real
         context = {
             "current_date": start_date,
-            "current_time": start_date.time(),
+            "current_time": start_time,
             "weather": weather
         }
         
-        enrichment_result = RulesEngineService.enrich_user_profile(
-            db=self.db,
-            user_profile_id=user_profile_id,
-            context=context
-        )
+        enrichment_result = self._enrich_profile_cached(user_profile_id, context)
         computed_profile = enrichment_result['computed_profile']
 
         # 3. Exploración BFS
@@ -96,31 +217,31 @@ class ItineraryGeneratorService:
             return {"error": "No se encontraron atracciones cercanas"}
 
         # 3. Scoring
-        ranked_candidates = self._rank_candidates(raw_candidates, computed_profile)
+        self._normalize_candidates(raw_candidates)
         daily_limit = computed_profile.get('max_daily_attractions', 4)
         total_needed = num_days * daily_limit
-        selected_candidates = ranked_candidates[:total_needed]
+        selected_candidates = self._rank_candidates(
+            raw_candidates,
+            computed_profile,
+            top_n=total_needed,
+            scorer=enrichment_result['scorer']
+        )
 
         # 4. Preparar para Clustering
         attractions_pool = []
         scores_map = {}
         duration_map = {} 
         
+        # Las coordenadas vienen en cada candidato desde el BFS (grafo en memoria)
         for item in selected_candidates:
             attr = item['attraction']
             score = item['score']
             
-            db_attr = self.db.query(Attraction).filter(Attraction.id == attr['id']).first()
-            if not db_attr or not db_attr.location:
+            lat, lon = attr.get('lat'), attr.get('lon')
+            if lat is None or lon is None:
                 continue
             
-            try:
-                point = to_shape(db_attr.location)
-                lat, lon = point.y, point.x
-            except Exception:
-                continue
-            
-            real_duration = db_attr.average_visit_duration or DEFAULT_VISIT_DURATION
+            real_duration = attr.get('average_visit_duration') or DEFAULT_VISIT_DURATION
             
             attractions_pool.append({
                 'id': attr['id'],
@@ -135,32 +256,8 @@ class ItineraryGeneratorService:
         # 5. Clustering
         daily_groups = DayClustering.cluster_attractions(attractions_pool, num_days)
 
-        # 6. Crear Itinerario en BD
+        # 6. Punto de partida
         hotel_id = hotel_attraction_id or city_center_attraction_id
-        
-        # Asegurar que start_date es datetime
-        if isinstance(start_date, str):
-            start_date = datetime.fromisoformat(start_date.replace('Z', '+00:00'))
-
-        itinerary = Itinerary(
-            user_profile_id=user_profile_id,
-            destination_id=destination_id,
-            start_point_id=hotel_id,
-            name=f"Itinerario {num_days} días",
-            num_days=num_days,
-            start_date=start_date.date(),
-            end_date=(start_date + timedelta(days=num_days - 1)).date(),
-            generation_params={
-                "optimization_mode": optimization_mode,
-                "max_radius_km": max_radius_km,
-                "max_candidates": max_candidates
-            },
-            algorithms_used={"search": "BFS", "routing": "A*", "clustering": "KMeans"},
-            status='draft'
-        )
-        
-        self.db.add(itinerary)
-        self.db.flush()
 
         # 7. Optimizar Días
         total_distance = 0.0
@@ -168,102 +265,164 @@ class ItineraryGeneratorService:
         total_cost = 0.0
         total_attractions_count = 0
         visit_order_global = 1
+        day_rows = []
+        day_attraction_ids = []
+        
+        # Centroides de todos los días en una pasada: las coordenadas ya están
+        # en memoria desde el paso 4, no hace falta consultarlas a PostGIS
+        day_centroids = [
+            tuple(np.mean([a['location_coords'] for a in group], axis=0).tolist()) if group else (None, None)
+            for group in daily_groups
+        ]
+        
+        # Grafo del destino cargado una sola vez para todas las rutas del itinerario
+        graph = GraphDataManager(self.db, destination_id)
+        
+        # Los días son independientes: se optimizan en los hilos de ruteo
+        # sin bloquear el event loop y los resultados se consumen en orden
+        day_waypoints = [[a['id'] for a in group] for group in daily_groups]
+        pending = [(idx, wps) for idx, wps in enumerate(day_waypoints) if wps]
+        loop = asyncio.get_running_loop()
+        results = await asyncio.gather(*(
+            loop.run_in_executor(
+                _routing_executor,
+                partial(
+                    self._optimize_day,
+                    waypoints=wps,
+                    hotel_id=hotel_id,
+                    optimization_mode=optimization_mode,
+                    scores_map=scores_map,
+                    duration_map=duration_map,
+                    graph=graph
+                )
+            )
+            for _, wps in pending
+        ))
+        route_results: Dict[int, Dict] = {
+            day_idx: route_result for (day_idx, _), route_result in zip(pending, results)
+        }
         
         for day_idx, group in enumerate(daily_groups):
             day_num = day_idx + 1
-            day_date = start_date.date() + timedelta(days=day_idx)
+            day_date = start_day + timedelta(days=day_idx)
             
             if not group:
                 continue
             
-            waypoints = [a['id'] for a in group]
-            
-            # Optimizar con A*
-            route_result = self.optimizer_service.optimize_multi_stop(
-                db=self.db,
-                start_attraction_id=hotel_id,
-                waypoints=waypoints,
-                end_attraction_id=hotel_id,
-                optimization_mode=optimization_mode,
-                attraction_scores=scores_map
-            )
+            waypoints = day_waypoints[day_idx]
+            route_result = route_results[day_idx]
             
             # Fallback si no encuentra ruta
             final_attractions_list = route_result['attractions'] if route_result['path_found'] else [{'id': wid, 'name': next((a['name'] for a in attractions_pool if a['id']==wid), '')} for wid in waypoints]
-            final_segments_list = route_result['segments'] if route_result['path_found'] else []
             day_distance = route_result['summary']['total_distance_meters'] if route_result['path_found'] else 0.0
             day_time = route_result['summary']['total_time_minutes'] if route_result['path_found'] else 0
             day_cost = route_result['summary']['total_cost'] if route_result['path_found'] else 0.0
 
-            centroid_lat = sum(a['location_coords'][0] for a in group) / len(group)
-            centroid_lon = sum(a['location_coords'][1] for a in group) / len(group)
+            centroid_lat, centroid_lon = day_centroids[day_idx]
             
-            # Preparar JSON
-            day_data_attractions = []
-            for i, attr_data in enumerate(final_attractions_list):
-                attr_id = attr_data['id']
-                duration = duration_map.get(attr_id, DEFAULT_VISIT_DURATION)
-                day_data_attractions.append({
-                    "attraction_id": attr_id,
-                    "order": i + 1,
-                    "visit_duration_minutes": duration,
-                    "score": scores_map.get(attr_id)
-                })
-
-            day_data_json = {
-                "attractions": day_data_attractions,
-                "segments": final_segments_list
-            }
+            # JSON del día: viene armado desde el optimizador; sólo se
+            # construye aquí para el fallback sin ruta
+            if route_result['path_found']:
+                day_data_json = route_result['day_data']
+            else:
+                day_data_json = {
+                    "attractions": [
+                        {
+                            "attraction_id": attr_data['id'],
+                            "order": i + 1,
+                            "visit_duration_minutes": duration_map.get(attr_data['id'], DEFAULT_VISIT_DURATION),
+                            "score": scores_map.get(attr_data['id'])
+                        }
+                        for i, attr_data in enumerate(final_attractions_list)
+                    ],
+                    "segments": []
+                }
             
-            itinerary_day = ItineraryDay(
-                itinerary_id=itinerary.id,
-                day_number=day_num,
-                date=day_date,
-                cluster_id=day_idx,
-                cluster_centroid_lat=centroid_lat,
-                cluster_centroid_lon=centroid_lon,
-                day_data=day_data_json,
-                total_distance_meters=day_distance,
-                total_time_minutes=day_time,
-                total_cost=day_cost,
-                attractions_count=len(waypoints),
-                optimization_score=route_result['summary'].get('optimization_score', 0)
-            )
-            
-            self.db.add(itinerary_day)
-            self.db.flush()
-            
-            for idx, attr_data in enumerate(final_attractions_list):
-                attr_id = attr_data['id']
-                duration = duration_map.get(attr_id, DEFAULT_VISIT_DURATION)
-                itinerary_attr = ItineraryAttraction(
-                    itinerary_id=itinerary.id,
-                    day_id=itinerary_day.id,
-                    attraction_id=attr_id,
-                    visit_order=visit_order_global,
-                    day_order=idx + 1,
-                    attraction_score=scores_map.get(attr_id),
-                    visit_duration_minutes=duration
-                )
-                self.db.add(itinerary_attr)
-                visit_order_global += 1
+            day_rows.append({
+                "day_number": day_num,
+                "date": day_date,
+                "cluster_id": day_idx,
+                "cluster_centroid_lat": centroid_lat,
+                "cluster_centroid_lon": centroid_lon,
+                "day_data": day_data_json,
+                "total_distance_meters": day_distance,
+                "total_time_minutes": day_time,
+                "total_cost": day_cost,
+                "attractions_count": len(waypoints),
+                "optimization_score": route_result['summary'].get('optimization_score', 0)
+            })
+            day_attraction_ids.append([attr_data['id'] for attr_data in final_attractions_list])
             
             total_distance = total_distance + day_distance
             total_time = total_time + day_time
             total_cost = total_cost + day_cost
             total_attractions_count = total_attractions_count + len(waypoints)
         
-        itinerary.total_distance_meters = total_distance
-        itinerary.total_duration_minutes = total_time
-        itinerary.total_cost = total_cost
-        itinerary.total_attractions = total_attractions_count
-        itinerary.average_optimization_score = 85.0
+        # 8. Crear Itinerario en BD con los totales ya calculados
+        itinerary = Itinerary(
+            user_profile_id=user_profile_id,
+            destination_id=destination_id,
+            start_point_id=hotel_id,
+            name=f"Itinerario {num_days} días",
+            num_days=num_days,
+            start_date=start_day,
+            end_date=end_day,
+            generation_params={
+                "optimization_mode": optimization_mode,
+                "max_radius_km": max_radius_km,
+                "max_candidates": max_candidates
+            },
+            algorithms_used={"search": "BFS", "routing": "A*+TSP", "clustering": "KMeans"},
+            status='draft',
+            total_distance_meters=total_distance,
+            total_duration_minutes=total_time,
+            total_cost=total_cost,
+            total_attractions=total_attractions_count,
+            average_optimization_score=85.0
+        )
+        
+        # Único flush: sólo para obtener itinerary.id
+        self.db.add(itinerary)
+        self.db.flush()
+        
+        # 9. Inserción masiva: un INSERT multi-fila para días y otro para atracciones
+        if day_rows:
+            for row in day_rows:
+                row["itinerary_id"] = itinerary.id
+            
+            if not self.PERSIST_ATTRACTION_JOIN_ROWS:
+                # day_data ya guarda las atracciones de cada día
+                self.db.execute(insert(ItineraryDay), day_rows)
+            else:
+                day_ids = self.db.scalars(
+                    insert(ItineraryDay).returning(ItineraryDay.id, sort_by_parameter_order=True),
+                    day_rows
+                ).all()
+                
+                attraction_rows = []
+                for day_id, attr_ids in zip(day_ids, day_attraction_ids):
+                    for idx, attr_id in enumerate(attr_ids):
+                        attraction_rows.append({
+                            "itinerary_id": itinerary.id,
+                            "day_id": day_id,
+                            "attraction_id": attr_id,
+                            "visit_order": visit_order_global,
+                            "day_order": idx + 1,
+                            "attraction_score": scores_map.get(attr_id),
+                            "visit_duration_minutes": duration_map.get(attr_id, DEFAULT_VISIT_DURATION)
+                        })
+                        visit_order_global += 1
+                
+                if attraction_rows:
+                    self._insert_attraction_rows(attraction_rows)
         
+        # El id ya se conoce desde el flush; leerlo después del commit
+        # (expire_on_commit) dispararía un SELECT de toda la fila
+        itinerary_id = itinerary.id
         self.db.commit()
-        self.db.refresh(itinerary)
         
         return {
-            "itinerary_id": itinerary.id,
+            "itinerary_id": itinerary_id,
             "message": "Itinerario generado exitosamente",
             "summary": {
                 "num_days": num_days,
@@ -274,82 +433,193 @@ class ItineraryGeneratorService:
             }
         }
 
-    def _rank_candidates(self, candidates_data: List[Dict], profile: Dict) -> List[Dict]:
+    def _optimize_day(
+        self,
+        waypoints: List[int],
+        hotel_id: int,
+        optimization_mode: str,
+        scores_map: Dict[int, float],
+        duration_map: Dict[int, int],
+        graph: GraphDataManager
+    ) -> Dict:
+        """
+        Optimizar la ruta de un día (matriz de pares A* + TSP)
+        
+        Se ejecuta en un hilo del pool: usa su propia sesión porque
+        `Session` no es thread-safe. El grafo en memoria sólo se lee.
+        """
+        db = SessionLocal()
+        try:
+            return self.optimizer_service.optimize_multi_stop_matrix(
+                db=db,
+                start_attraction_id=hotel_id,
+                waypoints=waypoints,
+                end_attraction_id=hotel_id,
+                optimization_mode=optimization_mode,
+                attraction_scores=scores_map,
+                graph=graph,
+                visit_durations=duration_map
+            )
+        finally:
+            db.close()
+
+    def _insert_attraction_rows(self, rows: List[Dict]) -> None:
+        """
+        Insertar filas de itinerary_attractions
+        
+        Con pocas filas se usa el INSERT masivo de SQLAlchemy; con muchas
+        (y driver psycopg2) se baja a `execute_values`, que arma un único
+        INSERT ... VALUES por página sin pasar por la capa ORM.
+        """
+        if len(rows) <= self.EXECUTE_VALUES_MIN_ROWS or self.db.get_bind().dialect.driver != 'psycopg2':
+            self.db.execute(insert(ItineraryAttraction), rows)
+            return
+        
+        # Misma conexión/transacción que la sesión; manually_added tiene
+        # default del lado de Python, por eso se envía explícito
+        cursor = self.db.connection().connection.cursor()
+        try:
+            execute_values(
+                cursor,
+                "INSERT INTO itinerary_attractions "
+                "(itinerary_id, day_id, attraction_id, visit_order, day_order, "
+                "attraction_score, visit_duration_minutes, manually_added) VALUES %s",
+                [
+                    (
+                        row["itinerary_id"], row["day_id"], row["attraction_id"],
+                        row["visit_order"], row["day_order"], row["attraction_score"],
+                        row["visit_duration_minutes"], False
+                    )
+                    for row in rows
+                ],
+                page_size=500
+            )
+        finally:
+            cursor.close()
+
+    @staticmethod
+    def _normalize_candidates(candidates_data: List[Dict]) -> None:
+        """
+        Normalizar una sola vez los campos que usa el ranking
+        
+        Agrega a cada `item['attraction']`:
+        - `_cat_lower`: categoría en minúsculas
+        - `_price_lower`: rango de precio en minúsculas
+        - `_amenities_set`: frozenset de amenidades
+        """
+        for item in candidates_data:
+            attr = item['attraction']
+            attr['_cat_lower'] = (attr.get('category') or '').lower()
+            attr['_price_lower'] = (attr.get('price_range') or '').lower()
+            attr['_amenities_set'] = frozenset(attr.get('amenities') or ())
+
+    @staticmethod
+    def _build_profile_scorer(profile: Dict) -> Dict:
+        """
+        Especializar el scoring para un perfil calculado
+        
+        Todo lo que depende sólo del perfil (índice y bonus de categorías,
+        precios permitidos, amenidades, rating mínimo y pesos) se resuelve
+        aquí una vez; `score` es el kernel con esos argumentos ya fijados.
+        """
+        priority_cats = set(profile.get('priority_categories', []))
+        recommended_cats = set(profile.get('recommended_categories', []))
+        avoid_cats = set(profile.get('avoid_categories', []))
+        
+        # Bonus por categoría indexado por id (0 = sin coincidencia).
+        # Se asigna en orden inverso de precedencia: priority > recommended > avoid
+        cat_weights = {}
+        for cat in avoid_cats:
+            cat_weights[cat] = SCORING_WEIGHTS['avoid_category']
+        for cat in recommended_cats:
+            cat_weights[cat] = SCORING_WEIGHTS['recommended_category']
+        for cat in priority_cats:
+            cat_weights[cat] = SCORING_WEIGHTS['priority_category']
+        cat_bonus = np.array([0.0, *cat_weights.values()], dtype=np.float64)
+        
+        return {
+            'cat_index': {cat: idx for idx, cat in enumerate(cat_weights, start=1)},
+            'allowed_prices': frozenset(profile.get('allowed_price_ranges', ['gratis', 'bajo', 'medio', 'alto'])),
+            'required_amenities': frozenset(profile.get('required_amenities', [])),
+            'score': partial(
+                score_kernel,
+                cat_bonus=cat_bonus,
+                weights=SCORE_WEIGHTS,
+                min_rating=float(profile.get('min_rating', 0.0))
+            )
+        }
+
+    def _rank_candidates(
+        self,
+        candidates_data: List[Dict],
+        profile: Dict,
+        top_n: Optional[int] = None,
+        scorer: Optional[Dict] = None
+    ) -> List[Dict]:
         """
         Rankear candidatos usando múltiples fuentes de datos:
         - Score de Red Neuronal (nn_score)
         - Rating de Google Places
         - Rating y popularidad de Foursquare
         - Preferencias del usuario
+        
+        Las features se empaquetan en arrays NumPy y el score se calcula
+        en una sola expresión vectorizada. Los candidatos deben pasar antes
+        por `_normalize_candidates`.
+        
+        Si se indica `top_n` sólo se devuelven los `top_n` mejores
+        (selección con heap en vez de ordenar todos). `scorer` es el
+        resultado de `_build_profile_scorer` si ya se construyó.
         """
-        scored_list = []
-        priority_cats = set(profile.get('priority_categories', []))
-        recommended_cats = set(profile.get('recommended_categories', []))
-        avoid_cats = set(profile.get('avoid_categories', []))
-        allowed_prices = set(profile.get('allowed_price_ranges', ['gratis', 'bajo', 'medio', 'alto']))
-        required_amenities = set(profile.get('required_amenities', []))
-        min_rating = profile.get('min_rating', 0.0)
-
-        for item in candidates_data:
-            attr = item['attraction']
-            dist_meters = item.get('distance_from_start', 0)
-            
-            score = 0.0
-            rating = attr.get('rating') or 3.0
-            
-            # ═══════════════════════════════════════════════════════════
-            # SCORE DE RED NEURONAL (peso más importante)
-            # nn_score está en rango [0, 1], lo escalamos para que tenga impacto significativo
-            # ═══════════════════════════════════════════════════════════
-            nn_score = item.get('nn_score', 0.5)  # 0.5 es el valor neutro
-            nn_weight = SCORING_WEIGHTS.get('nn_score_weight', 25.0)  # Peso alto para la NN
-            score = score + (nn_score * nn_weight)
-            logger.debug(f"  🧠 NN Score: {nn_score:.3f} → +{nn_score * nn_weight:.1f} puntos")
-            
-            # Base: Rating de Google Places
-            score = score + (rating * SCORING_WEIGHTS['rating_multiplier'])
-            
-            # Rating de Foursquare (escala 0-10)
-            foursquare_rating = attr.get('foursquare_rating') or 0.0
-            if foursquare_rating > 0:
-                score = score + (foursquare_rating * SCORING_WEIGHTS['foursquare_rating_multiplier'])
-                logger.debug(f"  📊 Foursquare rating bonus: +{foursquare_rating * SCORING_WEIGHTS['foursquare_rating_multiplier']:.1f}")
-            
-            # Popularidad de Foursquare (0-1)
-            foursquare_popularity = attr.get('foursquare_popularity') or 0.0
-            if foursquare_popularity > 0:
-                score = score + (foursquare_popularity * SCORING_WEIGHTS['foursquare_popularity_multiplier'])
-            
-            # Check-ins de Foursquare
-            foursquare_checkins = attr.get('foursquare_checkins') or 0
-            if foursquare_checkins > 0:
-                score = score + (foursquare_checkins * SCORING_WEIGHTS['foursquare_checkins_bonus'])
-            
-            cat = attr.get('category', '').lower()
-            if cat in priority_cats:
-                score = score + SCORING_WEIGHTS['priority_category']
-            elif cat in recommended_cats:
-                score = score + SCORING_WEIGHTS['recommended_category']
-            elif cat in avoid_cats:
-                score = score + SCORING_WEIGHTS['avoid_category']
-            
-            price = attr.get('price_range', '').lower()
-            if price not in allowed_prices:
-                score = score + SCORING_WEIGHTS['price_mismatch']
-            
-            attr_amenities = set(attr.get('amenities') or [])
-            missing_reqs = required_amenities - attr_amenities
-            if missing_reqs:
-                score = score + (len(missing_reqs) * SCORING_WEIGHTS['missing_amenity'])
-            
-            if rating < min_rating:
-                score = score + SCORING_WEIGHTS['rating_below_min']
-            
-            dist_km = dist_meters / 1000.0
-            score = score - (dist_km * SCORING_WEIGHTS['distance_penalty_per_km'])
-            
-            scored_list.append({'attraction': attr, 'score': round(score, 2)})
+        if not candidates_data:
+            return []
+        
+        if scorer is None:
+            scorer = self._build_profile_scorer(profile)
+        cat_index = scorer['cat_index']
+        allowed_prices = scorer['allowed_prices']
+        required_amenities = scorer['required_amenities']
+        
+        # ═══════════════════════════════════════════════════════════
+        # EMPAQUETADO DE FEATURES (una pasada por candidato)
+        # ═══════════════════════════════════════════════════════════
+        attrs = [item['attraction'] for item in candidates_data]
+        n = len(attrs)
+        
+        nn_scores = np.fromiter((item.get('nn_score', 0.5) for item in candidates_data), dtype=np.float64, count=n)
+        dists = np.fromiter((item.get('distance_from_start', 0) for item in candidates_data), dtype=np.float64, count=n)
+        ratings = np.fromiter((a.get('rating') or 3.0 for a in attrs), dtype=np.float64, count=n)
+        fsq_ratings = np.fromiter((a.get('foursquare_rating') or 0.0 for a in attrs), dtype=np.float64, count=n)
+        fsq_popularity = np.fromiter((a.get('foursquare_popularity') or 0.0 for a in attrs), dtype=np.float64, count=n)
+        fsq_checkins = np.fromiter((a.get('foursquare_checkins') or 0 for a in attrs), dtype=np.float64, count=n)
+        cat_ids = np.fromiter(
+            (cat_index.get(a['_cat_lower'], 0) for a in attrs), dtype=np.intp, count=n
+        )
+        price_bad = np.fromiter(
+            (a['_price_lower'] not in allowed_prices for a in attrs), dtype=np.bool_, count=n
+        )
+        if required_amenities:
+            missing = np.fromiter(
+                (len(required_amenities - a['_amenities_set']) for a in attrs), dtype=np.float64, count=n
+            )
+        else:
+            missing = np.zeros(n, dtype=np.float64)
+        
+        # ═══════════════════════════════════════════════════════════
+        # SCORE (kernel compilado con numba si está disponible)
+        # nn_score está en rango [0, 1] y tiene el peso más importante
+        # ═══════════════════════════════════════════════════════════
+        scores = scorer['score'](
+            nn_scores, ratings, fsq_ratings, fsq_popularity, fsq_checkins,
+            cat_ids, price_bad, missing, dists
+        )
+        scores = np.round(scores, 2)
         
-        scored_list.sort(key=lambda x: x['score'], reverse=True)
+        # Orden descendente estable (empates conservan el orden del BFS)
+        if top_n is not None and top_n < n:
+            score_list = scores.tolist()
+            order = heapq.nsmallest(top_n, range(n), key=lambda i: (-score_list[i], i))
+        else:
+            order = np.argsort(-scores, kind='stable')
         
-        return scored_list
\ No newline at end of file
+        return [{'attraction': attrs[i], 'score': float(scores[i])} for i in order]
@@ -0,0 +1,158 @@
+# backend/services/ml_service/data/_kernels.py
+"""
+Kernels numéricos para preparar datos de entrenamiento
+
+Con numba instalado el augmentation y el target score se calculan en
+bucles compilados y paralelos (una sola pasada, sin arrays temporales);
+sin numba se usan las versiones vectorizadas NumPy.
+"""
+import math
+
+import numpy as np
+
+from ..models.neural_network import create_target_score_array
+
+try:
+    from numba import njit, prange
+    NUMBA_AVAILABLE = True
+except ImportError:  # numba es opcional
+    NUMBA_AVAILABLE = False
+
+
+def _augment_numpy(features, targets, k, noise_f, tgt_noise_f):
+    n = features.shape[0]
+    rng = np.random.default_rng()
+    
+    # Salida reservada una vez: [originales | copias con ruido]
+    out_f = np.empty((k * n, features.shape[1]), dtype=np.float32)
+    out_f[:n] = features
+    noisy_f = out_f[n:]
+    rng.standard_normal(dtype=np.float32, out=noisy_f)
+    noisy_f *= noise_f
+    noisy_f.reshape(k - 1, n, features.shape[1])[...] += features
+    np.clip(noisy_f, 0, 1, out=noisy_f)
+    
+    out_t = np.empty(k * n, dtype=np.float32)
+    out_t[:n] = targets
+    noisy_t = out_t[n:]
+    rng.standard_normal(dtype=np.float32, out=noisy_t)
+    noisy_t *= tgt_noise_f
+    noisy_t.reshape(k - 1, n)[...] += targets
+    np.clip(noisy_t, 0, 1, out=noisy_t)
+    
+    return out_f, out_t
+
+
+if NUMBA_AVAILABLE:
+    @njit(parallel=True, fastmath=True, cache=True)
+    def _augment_jit(features, targets, k, noise_f, tgt_noise_f):
+        n, d = features.shape
+        out_f = np.empty((k * n, d), dtype=np.float32)
+        out_t = np.empty(k * n, dtype=np.float32)
+        
+        for j in prange(n):
+            out_t[j] = targets[j]
+            for c in range(d):
+                out_f[j, c] = features[j, c]
+        
+        # Cada hilo usa su propio generador de numba
+        for i in prange((k - 1) * n):
+            j = i % n
+            row = n + i
+            for c in range(d):
+                out_f[row, c] = min(max(features[j, c] + np.random.normal(0.0, noise_f), 0.0), 1.0)
+            out_t[row] = min(max(targets[j] + np.random.normal(0.0, tgt_noise_f), 0.0), 1.0)
+        
+        return out_f, out_t
+    
+    @njit(parallel=True, fastmath=True, cache=True)
+    def _target_scores_jit(raw):
+        n = raw.shape[0]
+        out = np.empty(n, dtype=np.float64)
+        log_1000 = math.log(1000.0)
+        log_10000 = math.log(10000.0)
+        
+        for i in prange(n):
+            rating = raw[i, 0]
+            total_reviews = raw[i, 1]
+            google_rating = raw[i, 2]
+            fsq_rating = raw[i, 4]
+            fsq_popularity = raw[i, 5]
+            fsq_checkins = raw[i, 6]
+            
+            # Rating (30%) - Promedio de las fuentes con valor > 0
+            rating_sum = 0.0
+            rating_count = 0
+            if rating > 0:
+                rating_sum += rating / 5.0
+                rating_count += 1
+            if google_rating > 0:
+                rating_sum += google_rating / 5.0
+                rating_count += 1
+            if fsq_rating > 0:
+                rating_sum += fsq_rating / 10.0
+                rating_count += 1
+            score = 0.0
+            if rating_count > 0:
+                score += 0.30 * (rating_sum / rating_count)
+            
+            # Popularidad (25%)
+            popularity = 0.0
+            if total_reviews > 0:
+                popularity += 0.4 * min(math.log(total_reviews + 1) / log_1000, 1.0)
+            if fsq_popularity > 0:
+                popularity += 0.3 * fsq_popularity
+            if fsq_checkins > 0:
+                popularity += 0.3 * min(math.log(fsq_checkins + 1) / log_10000, 1.0)
+            score += 0.25 * popularity
+            
+            # Sentiment (20%)
+            score += 0.20 * (raw[i, 8] / 100.0)
+            
+            # Verificado y accesible (10%)
+            quality = 0.0
+            if raw[i, 11] != 0:
+                quality += 0.5
+            if raw[i, 10] != 0:
+                quality += 0.5
+            score += 0.10 * quality
+            
+            # Precio (15%) - Óptimo en 0.4 (bajo-medio)
+            price_score = 1.0 - abs(raw[i, 9] - 0.4) * 2
+            score += 0.15 * min(max(price_score, 0.0), 1.0)
+            
+            out[i] = min(max(score, 0.0), 1.0)
+        
+        return out
+
+
+def augment(features, targets, k, noise_f, tgt_noise_f):
+    """
+    Devolver `k` copias de (features, targets): la original seguida de
+    `k - 1` con ruido gaussiano, recortadas a [0, 1]
+    
+    Args:
+        features: Array (N, D)
+        targets: Array (N,) o (N, 1)
+    
+    Returns:
+        (features (k·N, D) float32, targets (k·N, 1) float32)
+    """
+    features = np.ascontiguousarray(features, dtype=np.float32)
+    targets = np.ascontiguousarray(targets, dtype=np.float32).reshape(-1)
+    if NUMBA_AVAILABLE:
+        out_f, out_t = _augment_jit(features, targets, k, noise_f, tgt_noise_f)
+    else:
+        out_f, out_t = _augment_numpy(features, targets, k, noise_f, tgt_noise_f)
+    return out_f, out_t.reshape(-1, 1)
+
+
+def target_scores(raw):
+    """
+    Target score para cada fila de características crudas (N, 13)
+    (misma fórmula que `create_target_score`)
+    """
+    raw = np.ascontiguousarray(raw, dtype=np.float64)
+    if NUMBA_AVAILABLE:
+        return _target_scores_jit(raw)
+    return create_target_score_array(raw)
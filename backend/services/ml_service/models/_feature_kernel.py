@@ -0,0 +1,107 @@
+# backend/services/ml_service/models/_feature_kernel.py
+"""
+Kernel de construcción de características para inferencia
+
+Recibe las columnas de NN_FEATURE_COLUMNS ya convertidas a una matriz
+(N, 13) float64 (NaN = NULL; precio y categoría ya codificados) y aplica
+los defaults de `Attraction.get_features_for_nn()` y las reglas de
+`AttractionScorerNetwork.normalize_features_array`.
+
+Con numba instalado ambos pasos se hacen en un único bucle paralelo que
+escribe directamente la matriz float32 de entrada de la red; sin numba se
+usa la versión vectorizada NumPy.
+"""
+import numpy as np
+
+from .neural_network import (
+    AttractionScorerNetwork,
+    _INV_MAX_REVIEWS_LOG,
+    _INV_MAX_CHECKINS_LOG,
+    _INV5,
+    _INV10,
+    _INV100,
+)
+
+try:
+    from numba import njit, prange
+    NUMBA_AVAILABLE = True
+except ImportError:  # numba es opcional
+    NUMBA_AVAILABLE = False
+
+
+# Columna con default distinto de 0 cuando viene NULL o 0 (sentiment_positive_pct)
+_POSITIVE_PCT_COL = 8
+_POSITIVE_PCT_DEFAULT = 50.0
+
+# Mismas constantes (en float64) que la normalización NumPy
+_S_REVIEWS = float(_INV_MAX_REVIEWS_LOG)
+_S_CHECKINS = float(_INV_MAX_CHECKINS_LOG)
+_S5 = float(_INV5)
+_S10 = float(_INV10)
+_S100 = float(_INV100)
+
+
+def fill_defaults(raw: np.ndarray) -> np.ndarray:
+    """
+    Aplicar los defaults de `get_features_for_nn()` a una matriz cruda
+
+    NULL (NaN) pasa a 0 y sentiment_positive_pct NULL o 0 a 50, igual que
+    `float(x) if x else default`.
+
+    Returns:
+        Nueva matriz (N, 13) float64
+    """
+    filled = np.nan_to_num(raw, nan=0.0)
+    col = filled[:, _POSITIVE_PCT_COL]
+    col[col == 0] = _POSITIVE_PCT_DEFAULT
+    return filled
+
+
+def _build_numpy(raw):
+    return AttractionScorerNetwork.normalize_features_array(fill_defaults(raw))
+
+
+if NUMBA_AVAILABLE:
+    @njit(inline="always")
+    def _value(raw, i, c):
+        v = raw[i, c]
+        return 0.0 if np.isnan(v) else v
+
+    @njit(parallel=True, cache=True)
+    def _build_jit(raw):
+        n = raw.shape[0]
+        out = np.empty((n, 13), dtype=np.float32)
+        for i in prange(n):
+            out[i, 0] = min(_value(raw, i, 0) * _S5, 1.0)
+            out[i, 1] = np.log1p(max(_value(raw, i, 1), 0.0)) * _S_REVIEWS
+            out[i, 2] = min(_value(raw, i, 2) * _S5, 1.0)
+            out[i, 3] = np.log1p(max(_value(raw, i, 3), 0.0)) * _S_REVIEWS
+            out[i, 4] = min(_value(raw, i, 4) * _S10, 1.0)
+            out[i, 5] = min(max(_value(raw, i, 5), 0.0), 1.0)
+            out[i, 6] = np.log1p(max(_value(raw, i, 6), 0.0)) * _S_CHECKINS
+            out[i, 7] = (_value(raw, i, 7) + 1.0) * 0.5
+            pct = _value(raw, i, 8)
+            if pct == 0.0:
+                pct = _POSITIVE_PCT_DEFAULT
+            out[i, 8] = min(pct * _S100, 1.0)
+            out[i, 9] = min(max(_value(raw, i, 9), 0.0), 1.0)
+            out[i, 10] = 1.0 if _value(raw, i, 10) != 0.0 else 0.0
+            out[i, 11] = 1.0 if _value(raw, i, 11) != 0.0 else 0.0
+            out[i, 12] = min(max(_value(raw, i, 12), 0.0), 1.0)
+        return out
+
+
+def build_features(raw: np.ndarray) -> np.ndarray:
+    """
+    Matriz de entrada de la red a partir de columnas crudas
+
+    Args:
+        raw: Array (N, 13) float64 en el orden de FEATURE_NAMES (NaN = NULL)
+
+    Returns:
+        Array (N, 13) float32 normalizado
+    """
+    raw = np.ascontiguousarray(raw, dtype=np.float64)
+    if NUMBA_AVAILABLE and raw.shape[0]:
+        return _build_jit(raw)
+    return _build_numpy(raw)
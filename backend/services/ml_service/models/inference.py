@@ -9,42 +9,142 @@ Este módulo proporciona funciones de alto nivel para:
 4. Cache de predicciones para rendimiento
 """
 import asyncio
-from datetime import datetime
-from typing import Dict, List, Optional, Tuple
+import io
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future
+from typing import Any, Dict, List, Optional, Tuple
 from pathlib import Path
 import numpy as np
+import torch
 from sqlalchemy.orm import Session
-from sqlalchemy import update
+from sqlalchemy import Select, bindparam, select, update, func, Row
 
 from shared.database.models import Attraction
+from shared.database.models.attraction import NN_PRICE_LEVELS, NN_CATEGORIES
 from shared.utils.logger import setup_logger
 from shared.config.settings import get_settings
 from .neural_network import AttractionScorerNetwork, AttractionScorerTrainer
+from ._feature_kernel import build_features
+
+try:
+    import onnxruntime as ort
+    ONNXRUNTIME_AVAILABLE = True
+except ImportError:  # onnxruntime es opcional
+    ort = None
+    ONNXRUNTIME_AVAILABLE = False
 
 logger = setup_logger(__name__)
 settings = get_settings()
 
+# Columnas que necesita la red (mismo orden que AttractionScorerNetwork.FEATURE_NAMES)
+NN_FEATURE_COLUMNS = (
+    Attraction.rating,
+    Attraction.total_reviews,
+    Attraction.google_rating,
+    Attraction.google_reviews_count,
+    Attraction.foursquare_rating,
+    Attraction.foursquare_popularity,
+    Attraction.foursquare_checkins,
+    Attraction.sentiment_score,
+    Attraction.sentiment_positive_pct,
+    Attraction.price_range,
+    Attraction.accessibility,
+    Attraction.verified,
+    Attraction.category,
+)
+
+
+# Columnas de NN_FEATURE_COLUMNS que NumPy convierte directo a float
+# (Numeric/Integer/Boolean, None -> NaN); el resto se codifica aparte
+_NN_NUMERIC_COLS = (0, 1, 2, 3, 4, 5, 6, 7, 8, 11)
+_NN_CATEGORY_CODES = {
+    category: i / len(NN_CATEGORIES) for i, category in enumerate(NN_CATEGORIES)
+}
+
+
+def nn_raw_feature_matrix(rows: List[Tuple], first_col: int = 0) -> np.ndarray:
+    """
+    Matriz cruda (N, 13) float64 para filas que contienen NN_FEATURE_COLUMNS
+    
+    Se convierte columna a columna (sin una tupla/diccionario por fila).
+    Precio, accesibilidad y categoría ya quedan codificados; los NULL de
+    las columnas numéricas quedan como NaN (ver `_feature_kernel`).
+    
+    Args:
+        rows: Filas de la consulta
+        first_col: Posición de la primera columna de características
+            (1 si la fila empieza con Attraction.id)
+    """
+    n = len(rows)
+    raw = np.empty((n, AttractionScorerNetwork.INPUT_SIZE), dtype=np.float64)
+    if n == 0:
+        return raw
+    
+    columns = list(zip(*rows))[first_col:]
+    for c in _NN_NUMERIC_COLS:
+        raw[:, c] = np.array(columns[c], dtype=np.float64)
+    raw[:, 9] = np.fromiter(
+        (NN_PRICE_LEVELS.get(price, 0.5) for price in columns[9]), dtype=np.float64, count=n
+    )
+    raw[:, 10] = np.fromiter(
+        (1.0 if accessibility else 0.0 for accessibility in columns[10]), dtype=np.float64, count=n
+    )
+    raw[:, 12] = np.fromiter(
+        (_NN_CATEGORY_CODES.get(category, 0.5) for category in columns[12]), dtype=np.float64, count=n
+    )
+    return raw
+
+
+def nn_feature_matrix(rows: List[Tuple], first_col: int = 0) -> np.ndarray:
+    """
+    Matriz de entrada de la red (N, 13) float32, ya normalizada, para filas
+    que contienen NN_FEATURE_COLUMNS (mismos valores que
+    `normalize_features(attraction.get_features_for_nn())`)
+    """
+    return build_features(nn_raw_feature_matrix(rows, first_col))
+
 
 class AttractionScorer:
     """
     Clase principal para inferencia de scores de atracciones
     
-    Singleton para evitar múltiples cargas del modelo
+    Singleton para evitar múltiples cargas del modelo. La carga usa un
+    lock con doble verificación: si varios hilos crean el scorer a la vez,
+    sólo uno lee el archivo y compila el modelo.
     """
     
     _instance: Optional['AttractionScorer'] = None
     _model: Optional[AttractionScorerNetwork] = None
+    _forward: Optional[torch.nn.Module] = None  # grafo compilado (o el modelo eager)
+    _onnx_session = None  # sesión de ONNX Runtime (NN_USE_ONNX)
     _is_loaded: bool = False
+    _device: torch.device = torch.device("cuda" if torch.cuda.is_available() else "cpu")
+    _lock = threading.Lock()
+    # Validación de la cuantización int8 contra float32
+    QUANTIZE_CANARY_SIZE = 256
+    QUANTIZE_MAX_MAE = 1e-3
+    # Buffers de entrada (pinned + dispositivo) reutilizados, uno por hilo
+    _input_buffers = threading.local()
     
     def __new__(cls):
         if cls._instance is None:
-            cls._instance = super().__new__(cls)
+            with cls._lock:
+                if cls._instance is None:
+                    cls._instance = super().__new__(cls)
         return cls._instance
     
     def __init__(self):
         # Solo inicializar una vez
+        self._ensure_loaded()
+    
+    def _ensure_loaded(self) -> None:
+        """Cargar el modelo si aún no se cargó (doble verificación con lock)"""
         if not self._is_loaded:
-            self._load_or_create_model()
+            with self._lock:
+                if not self._is_loaded:
+                    self._load_or_create_model()
     
     def _load_or_create_model(self) -> None:
         """
@@ -55,16 +155,14 @@ class AttractionScorer:
         try:
             if model_path.exists():
                 trainer = AttractionScorerTrainer()
-                trainer.load_model(str(model_path))
+                trainer.load_model(str(model_path), for_inference=True)
                 self._model = trainer.model
-                self._is_loaded = True
                 logger.info("Modelo de scoring cargado exitosamente")
             else:
                 # Crear modelo nuevo (sin entrenar)
                 self._model = AttractionScorerNetwork(
                     hidden_size=settings.NN_HIDDEN_SIZE
                 )
-                self._is_loaded = True
                 logger.warning(
                     "No se encontró modelo entrenado. "
                     "Usando modelo sin entrenar (scores por defecto)"
@@ -73,13 +171,120 @@ class AttractionScorer:
             logger.error(f"Error cargando modelo: {str(e)}")
             # Fallback a modelo nuevo
             self._model = AttractionScorerNetwork()
-            self._is_loaded = True
+        
+        # Con varios workers de uvicorn, un hilo por proceso evita que se
+        # peleen por los núcleos y da latencias estables
+        if settings.NN_NUM_THREADS > 0:
+            torch.set_num_threads(settings.NN_NUM_THREADS)
+        
+        # Sólo se usa para inferencia: modo eval y dispositivo una sola vez
+        self._model.eval()
+        self._model.to(self._device)
+        
+        # ONNX se exporta desde el modelo float32 (antes de cuantizar)
+        self._onnx_session = None
+        if settings.NN_USE_ONNX and self._device.type == "cpu":
+            self._load_onnx_session()
+        
+        if settings.NN_QUANTIZE and self._device.type == "cpu":
+            self._quantize_model()
+        
+        self._compile_model()
+        
+        # Se marca al final: otros hilos no ven un modelo a medio preparar
+        self._is_loaded = True
+    
+    def _quantize_model(self) -> None:
+        """
+        Cuantizar las capas Linear a int8 (cuantización dinámica)
+        
+        Reduce el ancho de banda de lectura de pesos en el scoring por lotes
+        en CPU. Antes de usarlo se compara con el modelo float32 sobre un
+        conjunto canario fijo: si el error medio supera QUANTIZE_MAX_MAE, o
+        si falla (p.ej. backend sin soporte), se mantiene el float32.
+        """
+        try:
+            canary = torch.from_numpy(
+                np.random.default_rng(0).random(
+                    (self.QUANTIZE_CANARY_SIZE, AttractionScorerNetwork.INPUT_SIZE),
+                    dtype=np.float32
+                )
+            )
+            with torch.inference_mode():
+                baseline = self._model(canary)
+            
+            quantized = self._model.quantize()
+            with torch.inference_mode():
+                mae = (quantized(canary) - baseline).abs().mean().item()
+            
+            if mae > self.QUANTIZE_MAX_MAE:
+                # quantize() deja la copia cacheada en el modelo float32
+                self._model.__dict__.pop("_quantized_module", None)
+                self._model.__dict__.pop("_traced_module", None)
+                logger.warning(
+                    f"Cuantización descartada: MAE {mae:.2e} frente a float32 "
+                    f"(máximo {self.QUANTIZE_MAX_MAE:.0e})"
+                )
+                return
+            
+            self._model = quantized
+            logger.info(f"Modelo de scoring cuantizado a int8 (MAE canario {mae:.2e})")
+        except Exception as e:
+            logger.warning(f"No se pudo cuantizar el modelo: {str(e)}")
+    
+    def _load_onnx_session(self) -> None:
+        """
+        Exportar el modelo cargado a ONNX y abrir una sesión de ONNX Runtime
+        
+        Con todas las optimizaciones de grafo, ORT fusiona MatMul+Add y la
+        activación en kernels de CPU propios; predict_matrix la usa en vez
+        de PyTorch. Si onnxruntime no está instalado o algo falla se sigue
+        con el modelo de PyTorch.
+        
+        La exportación se hace en memoria: con varios workers (o durante
+        una recarga) ningún proceso lee un archivo a medio escribir por otro.
+        """
+        if not ONNXRUNTIME_AVAILABLE:
+            logger.warning("NN_USE_ONNX activo pero onnxruntime no está instalado")
+            return
+        
+        try:
+            buffer = self._model.export_onnx(io.BytesIO())
+            options = ort.SessionOptions()
+            options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+            self._onnx_session = ort.InferenceSession(
+                buffer.getvalue(), options, providers=["CPUExecutionProvider"]
+            )
+            logger.info("Scoring por lotes con ONNX Runtime")
+        except Exception as e:
+            logger.warning(f"No se pudo preparar ONNX Runtime: {str(e)}")
+            self._onnx_session = None
+    
+    def _compile_model(self) -> None:
+        """
+        Compilar el forward con TorchScript (trace + freeze) una sola vez
+        
+        El MLP es tan pequeño que en modo eager domina el overhead de
+        dispatch por operación; freeze además pliega BatchNorm en las
+        Linear. Si el trace falla se usa el modelo eager.
+        """
+        try:
+            example = torch.zeros(64, AttractionScorerNetwork.INPUT_SIZE, device=self._device)
+            traced = torch.jit.freeze(torch.jit.trace(self._model, example))
+            
+            # Calentar con los tamaños de batch habituales
+            with torch.inference_mode():
+                traced(example)
+                traced(example[:1])
+            self._forward = traced
+        except Exception as e:
+            logger.warning(f"No se pudo compilar el modelo, usando modo eager: {str(e)}")
+            self._forward = self._model
     
     @property
     def model(self) -> AttractionScorerNetwork:
         """Obtener el modelo cargado"""
-        if not self._model:
-            self._load_or_create_model()
+        self._ensure_loaded()
         return self._model
     
     def predict_score(self, features: Dict[str, float]) -> float:
@@ -115,10 +320,87 @@ class AttractionScorer:
             return []
         
         try:
-            return self.model.predict_batch(features_list)
+            raw = AttractionScorerNetwork.features_to_array(features_list)
+            normalized = AttractionScorerNetwork.normalize_features_array(raw)
         except Exception as e:
             logger.error(f"Error en predicción batch: {str(e)}")
             return [0.5] * len(features_list)
+        return self.predict_normalized_batch(normalized)
+    
+    def predict_normalized_batch(self, features: np.ndarray) -> List[float]:
+        """
+        Como `predict_matrix`, pero con score neutro (0.5) si falla
+        
+        Args:
+            features: Array float32 (B, 13) ya normalizado
+        
+        Returns:
+            Lista de B scores
+        """
+        try:
+            return self.predict_matrix(features).tolist()
+        except Exception as e:
+            logger.error(f"Error en predicción batch: {str(e)}")
+            return [0.5] * len(features)
+    
+    def predict_feature_rows(self, rows: List[Tuple]) -> Tuple[List[int], List[float]]:
+        """
+        Predecir scores para filas (id, *NN_FEATURE_COLUMNS) de una consulta
+        
+        Returns:
+            Tuple de (ids, scores) en el orden de las filas
+        """
+        if not rows:
+            return [], []
+        ids = [row[0] for row in rows]
+        features = nn_feature_matrix(rows, first_col=1)
+        return ids, self.predict_normalized_batch(features)
+    
+    def predict_matrix(self, features: np.ndarray) -> np.ndarray:
+        """
+        Predecir scores para una matriz ya normalizada
+        
+        Args:
+            features: Array float32 de shape (B, 13)
+        
+        Returns:
+            Array (B,) con scores entre 0 y 1
+        """
+        self._ensure_loaded()
+        features = np.ascontiguousarray(features, dtype=np.float32)
+        
+        if self._onnx_session is not None:
+            return self._onnx_session.run(None, {"x": features})[0].ravel()
+        
+        x = torch.from_numpy(features)
+        if self._device.type == "cuda":
+            x = self._device_input(x)
+        
+        with torch.inference_mode():
+            return self._forward(x).cpu().numpy().ravel()
+    
+    def _device_input(self, x: torch.Tensor) -> torch.Tensor:
+        """
+        Copiar `x` (B, 13) a la GPU a través de buffers reservados una vez
+        
+        `pin_memory()` reserva memoria fijada nueva en cada llamada; aquí
+        el buffer fijado y el de dispositivo se reutilizan y sólo crecen
+        (a la siguiente potencia de 2) cuando llega un batch mayor. En CPU
+        no hace falta: `torch.from_numpy` ya no copia.
+        """
+        n = x.shape[0]
+        buffers = self._input_buffers
+        pinned = getattr(buffers, "pinned", None)
+        if pinned is None or pinned.shape[0] < n:
+            size = 1 << max(n - 1, 0).bit_length()
+            buffers.pinned = torch.empty(size, x.shape[1], pin_memory=True)
+            buffers.device = torch.empty(size, x.shape[1], device=self._device)
+        
+        # La copia anterior ya terminó: predict_matrix sincroniza con .cpu()
+        buffers.pinned[:n].copy_(x)
+        device_x = buffers.device[:n]
+        device_x.copy_(buffers.pinned[:n], non_blocking=True)
+        return device_x
     
     def reload_model(self) -> bool:
         """
@@ -128,23 +410,125 @@ class AttractionScorer:
             True si se cargó exitosamente
         """
         try:
-            self._is_loaded = False
-            self._model = None
-            self._load_or_create_model()
+            with self._lock:
+                self._is_loaded = False
+                self._load_or_create_model()
             return self._is_loaded
         except Exception as e:
             logger.error(f"Error recargando modelo: {str(e)}")
             return False
 
 
+class AsyncScorer:
+    """
+    Agrupa predicciones individuales en una sola pasada batch
+
+    Pensado para bucles de búsqueda (BFS/A*) que puntúan candidatos uno a
+    uno: `submit` encola las características y devuelve un Future. La cola
+    se vacía al llegar a `max_batch` pendientes o, como muy tarde,
+    `max_delay` segundos después del primer envío, con una única llamada a
+    `predict_scores_batch`.
+    """
+
+    def __init__(
+        self,
+        scorer: Optional[AttractionScorer] = None,
+        max_batch: int = 32,
+        max_delay: float = 0.001
+    ):
+        self._scorer = scorer or get_scorer()
+        self._max_batch = max_batch
+        self._max_delay = max_delay
+        self._pending: List[Tuple[Dict[str, float], Future]] = []
+        self._timer: Optional[threading.Timer] = None
+        self._lock = threading.Lock()
+
+    def submit(self, features: Dict[str, float]) -> "Future[float]":
+        """Encolar una atracción; el Future se resuelve con su score"""
+        future: Future = Future()
+        with self._lock:
+            self._pending.append((features, future))
+            if len(self._pending) >= self._max_batch:
+                batch = self._take_locked()
+            else:
+                batch = None
+                if self._timer is None:
+                    self._timer = threading.Timer(self._max_delay, self.flush)
+                    self._timer.daemon = True
+                    self._timer.start()
+
+        if batch:
+            self._run(batch)
+        return future
+
+    def score_many(self, features_list: List[Dict[str, float]]) -> List[float]:
+        """Enviar varias atracciones y esperar sus scores (en el mismo orden)"""
+        futures = [self.submit(features) for features in features_list]
+        self.flush()
+        return [future.result() for future in futures]
+
+    def flush(self) -> None:
+        """Procesar ya lo que haya pendiente"""
+        with self._lock:
+            batch = self._take_locked()
+        if batch:
+            self._run(batch)
+
+    def _take_locked(self) -> List[Tuple[Dict[str, float], Future]]:
+        batch, self._pending = self._pending, []
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        return batch
+
+    def _run(self, batch: List[Tuple[Dict[str, float], Future]]) -> None:
+        # predict_scores_batch ya devuelve 0.5 por atracción si falla
+        scores = self._scorer.predict_scores_batch([features for features, _ in batch])
+        for (_, future), score in zip(batch, scores):
+            future.set_result(score)
+
+
 class ScoringService:
     """
     Servicio para actualizar scores en la base de datos
     """
     
+    SCORES_QUERY_CHUNK = 1000  # máximo de IDs por cláusula IN
+    
+    # Sentencias fijas: se construyen una vez y los valores se enlazan al
+    # ejecutar (IN expandible), así la clave de la caché de compilación de
+    # SQLAlchemy es la misma en cada petición. Válidas también en AsyncSession.
+    FEATURE_ROWS_STMT = select(Attraction.id, *NN_FEATURE_COLUMNS).where(
+        Attraction.id.in_(bindparam("ids", expanding=True))
+    )
+    EXISTING_IDS_STMT = select(Attraction.id).where(
+        Attraction.id.in_(bindparam("ids", expanding=True))
+    )
+    SCORES_STMT = select(Attraction.id, Attraction.nn_score).where(
+        Attraction.id.in_(bindparam("ids", expanding=True))
+    )
+    TOP_SCORED_STMT = select(
+        Attraction.id,
+        Attraction.name,
+        Attraction.category,
+        Attraction.rating,
+        Attraction.nn_score,
+        Attraction.google_rating,
+        Attraction.total_reviews,
+        Attraction.image_url
+    ).where(
+        Attraction.destination_id == bindparam("destination_id"),
+        # Coincide con los índices parciales; además, en PostgreSQL
+        # DESC pondría primero las atracciones sin score (NULLS FIRST)
+        Attraction.nn_score.isnot(None)
+    ).order_by(Attraction.nn_score.desc()).limit(bindparam("limit"))
+    TOP_SCORED_BY_CATEGORY_STMT = TOP_SCORED_STMT.where(
+        Attraction.category == bindparam("category")
+    )
+    
     def __init__(self, db: Session):
         self.db = db
-        self.scorer = AttractionScorer()
+        self.scorer = get_scorer()
     
     def score_attraction(self, attraction: Attraction) -> float:
         """
@@ -186,7 +570,7 @@ class ScoringService:
         
         # Actualizar en BD
         attraction.nn_score = score
-        attraction.nn_score_updated_at = datetime.now()
+        attraction.nn_score_updated_at = func.now()
         
         if commit:
             self.db.commit()
@@ -194,6 +578,68 @@ class ScoringService:
         
         return score
     
+    def _bulk_update_scores(
+        self,
+        attraction_ids: List[int],
+        scores: List[float]
+    ) -> None:
+        """
+        Guardar scores de un lote con un UPDATE por clave primaria (executemany)
+        
+        Evita que el flush del ORM emita y siga un UPDATE por objeto. La
+        fecha la pone la BD (now()), así por fila sólo viajan id y score.
+        """
+        payload = [
+            {"id": attraction_id, "nn_score": float(score)}
+            for attraction_id, score in zip(attraction_ids, scores)
+        ]
+        if payload:
+            self.db.execute(
+                update(Attraction).values(nn_score_updated_at=func.now()),
+                payload
+            )
+    
+    def _score_rows(self, rows: List[Tuple]) -> Tuple[List[int], List[float]]:
+        """Predecir scores para filas (id, *NN_FEATURE_COLUMNS)"""
+        return self.scorer.predict_feature_rows(rows)
+    
+    def predict_scores(self, attraction_ids: List[int]) -> Dict[int, float]:
+        """
+        Predecir con el modelo (sin guardar) los scores de varias atracciones
+        
+        Lee sólo las columnas de features, en consultas acotadas por
+        SCORES_QUERY_CHUNK, y hace una única pasada batch por la red.
+        
+        Args:
+            attraction_ids: Lista de IDs
+        
+        Returns:
+            Diccionario {id: score} (los IDs inexistentes se omiten)
+        """
+        if not attraction_ids:
+            return {}
+        
+        rows = []
+        for i in range(0, len(attraction_ids), self.SCORES_QUERY_CHUNK):
+            chunk = attraction_ids[i:i + self.SCORES_QUERY_CHUNK]
+            rows.extend(self.db.execute(self.FEATURE_ROWS_STMT, {"ids": chunk}).all())
+        
+        ids, scores = self._score_rows(rows)
+        return dict(zip(ids, scores))
+    
+    def update_rows_scores(self, rows: List[Tuple]) -> int:
+        """
+        Predecir y guardar scores para filas (id, *NN_FEATURE_COLUMNS)
+        
+        No hace commit.
+        
+        Returns:
+            Número de filas actualizadas
+        """
+        ids, scores = self._score_rows(rows)
+        self._bulk_update_scores(ids, scores)
+        return len(ids)
+    
     def update_destination_scores(
         self,
         destination_id: int,
@@ -209,8 +655,8 @@ class ScoringService:
         Returns:
             Diccionario con estadísticas
         """
-        # Obtener todas las atracciones del destino
-        attractions = self.db.query(Attraction).filter(
+        # Sólo el id y las columnas de características (sin objetos ORM)
+        attractions = self.db.query(Attraction.id, *NN_FEATURE_COLUMNS).filter(
             Attraction.destination_id == destination_id
         ).all()
         
@@ -224,29 +670,15 @@ class ScoringService:
         for i in range(0, len(attractions), batch_size):
             batch = attractions[i:i + batch_size]
             
-            # Obtener features de todo el batch
-            features_list = [a.get_features_for_nn() for a in batch]
-            
-            # Predecir scores en batch
-            scores = self.scorer.predict_scores_batch(features_list)
-            
-            # Actualizar en BD
-            for attraction, score in zip(batch, scores):
-                try:
-                    attraction.nn_score = score
-                    attraction.nn_score_updated_at = datetime.now()
-                    updated += 1
-                except Exception as e:
-                    logger.error(f"Error actualizando {attraction.id}: {str(e)}")
-                    errors += 1
-            
-            # Commit por batch
+            # Predecir y actualizar en BD (un UPDATE por lote), commit por batch
             try:
+                count = self.update_rows_scores(batch)
                 self.db.commit()
+                updated += count
             except Exception as e:
                 logger.error(f"Error en commit: {str(e)}")
                 self.db.rollback()
-                errors += batch_size
+                errors += len(batch)
         
         logger.info(
             f"Scores actualizados para destino {destination_id}: "
@@ -276,33 +708,29 @@ class ScoringService:
         updated = 0
         errors = 0
         
-        # Procesar en batches para no cargar toda la BD en memoria
-        offset = 0
+        # Procesar en batches para no cargar toda la BD en memoria.
+        # Paginación por clave (id > último id) en vez de OFFSET, que
+        # obliga a la BD a recorrer de nuevo las filas ya procesadas
+        last_id = 0
         
-        while offset < total_count:
-            attractions = self.db.query(Attraction).offset(offset).limit(batch_size).all()
+        while True:
+            attractions = self.db.query(Attraction.id, *NN_FEATURE_COLUMNS).filter(
+                Attraction.id > last_id
+            ).order_by(Attraction.id).limit(batch_size).all()
             
             if not attractions:
                 break
             
-            features_list = [a.get_features_for_nn() for a in attractions]
-            scores = self.scorer.predict_scores_batch(features_list)
-            
-            for attraction, score in zip(attractions, scores):
-                try:
-                    attraction.nn_score = score
-                    attraction.nn_score_updated_at = datetime.now()
-                    updated += 1
-                except Exception as e:
-                    errors += 1
+            last_id = attractions[-1].id
             
             try:
+                count = self.update_rows_scores(attractions)
                 self.db.commit()
+                updated += count
             except Exception as e:
-                logger.error(f"Error en commit batch {offset}: {str(e)}")
+                logger.error(f"Error en commit batch (id <= {last_id}): {str(e)}")
                 self.db.rollback()
-            
-            offset += batch_size
+                errors += len(attractions)
             
             # Log progreso cada 500
             if updated % 500 == 0:
@@ -324,7 +752,7 @@ class ScoringService:
         destination_id: int,
         limit: int = 50,
         category: Optional[str] = None
-    ) -> List[Tuple[Attraction, float]]:
+    ) -> List[Row]:
         """
         Obtener atracciones con mejores scores
         
@@ -334,21 +762,29 @@ class ScoringService:
             category: Filtrar por categoría
         
         Returns:
-            Lista de tuplas (atracción, score)
+            Filas con las columnas de presentación (acceso por atributo:
+            id, name, category, rating, nn_score, google_rating,
+            total_reviews, image_url)
         """
-        query = self.db.query(Attraction).filter(
-            Attraction.destination_id == destination_id
-        )
-        
+        return self.db.execute(
+            *self.top_scored_statement(destination_id, limit, category)
+        ).all()
+    
+    @staticmethod
+    def top_scored_statement(
+        destination_id: int,
+        limit: int = 50,
+        category: Optional[str] = None
+    ) -> Tuple[Select, Dict[str, Any]]:
+        """
+        SELECT de `get_top_scored_attractions` y sus parámetros
+        (también para AsyncSession: `execute(*top_scored_statement(...))`)
+        """
+        params = {"destination_id": destination_id, "limit": limit}
         if category:
-            query = query.filter(Attraction.category == category)
-        
-        # Ordenar por nn_score descendente
-        attractions = query.order_by(
-            Attraction.nn_score.desc()
-        ).limit(limit).all()
-        
-        return [(a, float(a.nn_score) if a.nn_score else 0.5) for a in attractions]
+            params["category"] = category
+            return ScoringService.TOP_SCORED_BY_CATEGORY_STMT, params
+        return ScoringService.TOP_SCORED_STMT, params
     
     def get_scores_dict(
         self,
@@ -368,15 +804,17 @@ class ScoringService:
         if not attraction_ids:
             return {}
         
-        attractions = self.db.query(
-            Attraction.id, Attraction.nn_score
-        ).filter(
-            Attraction.id.in_(attraction_ids)
-        ).all()
+        # IN acotado por consulta: listas de miles de parámetros encarecen
+        # la planificación. El índice (id) INCLUDE (nn_score) permite
+        # resolver cada consulta con un index-only scan
+        rows = []
+        for i in range(0, len(attraction_ids), self.SCORES_QUERY_CHUNK):
+            chunk = attraction_ids[i:i + self.SCORES_QUERY_CHUNK]
+            rows.extend(self.db.execute(self.SCORES_STMT, {"ids": chunk}).all())
         
         return {
-            a.id: float(a.nn_score) if a.nn_score else 0.5
-            for a in attractions
+            attraction_id: float(nn_score) if nn_score else 0.5
+            for attraction_id, nn_score in rows
         }
 
 
@@ -384,66 +822,131 @@ class ScoreCache:
     """
     Cache en memoria para scores de atracciones
     
-    Evita consultas repetidas a la BD durante la optimización
+    Evita consultas repetidas a la BD durante la optimización.
+    Dividido en shards (por `id & (NUM_SHARDS - 1)`), cada uno con su LRU
+    y su lock, para que varios workers puedan leer/escribir sin pisarse.
     """
     
+    NUM_SHARDS = 16  # potencia de 2
+    
     def __init__(self, max_size: int = 10000):
-        self._cache: Dict[int, Tuple[float, datetime]] = {}
+        # LRU por shard: el orden de inserción/uso lo mantiene el OrderedDict
+        # (score, instante monotónico de escritura)
+        self._shards: List["OrderedDict[int, Tuple[float, float]]"] = [
+            OrderedDict() for _ in range(self.NUM_SHARDS)
+        ]
+        self._locks = [threading.Lock() for _ in range(self.NUM_SHARDS)]
         self._max_size = max_size
+        self._shard_max_size = max(1, -(-max_size // self.NUM_SHARDS))
         self._ttl_seconds = 3600  # 1 hora
     
+    def _group_by_shard(self, attraction_ids) -> Dict[int, List[int]]:
+        groups: Dict[int, List[int]] = {}
+        mask = self.NUM_SHARDS - 1
+        for aid in attraction_ids:
+            groups.setdefault(aid & mask, []).append(aid)
+        return groups
+    
+    def _get_locked(self, shard: OrderedDict, attraction_id: int, now: float) -> Optional[float]:
+        entry = shard.get(attraction_id)
+        if entry is None:
+            return None
+        
+        score, timestamp = entry
+        # Verificar TTL
+        if now - timestamp < self._ttl_seconds:
+            shard.move_to_end(attraction_id)
+            return score
+        
+        del shard[attraction_id]
+        return None
+    
+    def _set_locked(self, shard: OrderedDict, attraction_id: int, score: float, now: float) -> None:
+        shard[attraction_id] = (score, now)
+        shard.move_to_end(attraction_id)
+        
+        # Eliminar las entradas menos usadas si excede tamaño máximo
+        while len(shard) > self._shard_max_size:
+            shard.popitem(last=False)
+    
     def get(self, attraction_id: int) -> Optional[float]:
         """Obtener score del cache"""
-        if attraction_id in self._cache:
-            score, timestamp = self._cache[attraction_id]
-            # Verificar TTL
-            if (datetime.now() - timestamp).seconds < self._ttl_seconds:
-                return score
-            else:
-                del self._cache[attraction_id]
-        return None
+        idx = attraction_id & (self.NUM_SHARDS - 1)
+        with self._locks[idx]:
+            return self._get_locked(self._shards[idx], attraction_id, time.monotonic())
     
     def set(self, attraction_id: int, score: float) -> None:
         """Guardar score en cache"""
-        # Limpiar si excede tamaño máximo
-        if len(self._cache) >= self._max_size:
-            # Eliminar entradas más antiguas
-            oldest = sorted(
-                self._cache.items(),
-                key=lambda x: x[1][1]
-            )[:self._max_size // 4]
-            for k, _ in oldest:
-                del self._cache[k]
-        
-        self._cache[attraction_id] = (score, datetime.now())
+        idx = attraction_id & (self.NUM_SHARDS - 1)
+        with self._locks[idx]:
+            self._set_locked(self._shards[idx], attraction_id, score, time.monotonic())
     
     def get_many(self, attraction_ids: List[int]) -> Dict[int, float]:
-        """Obtener múltiples scores del cache"""
+        """Obtener múltiples scores del cache (un lock por shard)"""
         result = {}
-        for aid in attraction_ids:
-            score = self.get(aid)
-            if score is not None:
-                result[aid] = score
+        now = time.monotonic()
+        for idx, ids in self._group_by_shard(attraction_ids).items():
+            shard = self._shards[idx]
+            with self._locks[idx]:
+                for aid in ids:
+                    score = self._get_locked(shard, aid, now)
+                    if score is not None:
+                        result[aid] = score
         return result
     
     def set_many(self, scores: Dict[int, float]) -> None:
-        """Guardar múltiples scores"""
-        for aid, score in scores.items():
-            self.set(aid, score)
+        """Guardar múltiples scores (un lock por shard)"""
+        now = time.monotonic()
+        for idx, ids in self._group_by_shard(scores).items():
+            shard = self._shards[idx]
+            with self._locks[idx]:
+                for aid in ids:
+                    self._set_locked(shard, aid, scores[aid], now)
+    
+    def invalidate_many(self, attraction_ids: List[int]) -> None:
+        """Eliminar sólo las entradas indicadas (un lock por shard)"""
+        for idx, ids in self._group_by_shard(attraction_ids).items():
+            shard = self._shards[idx]
+            with self._locks[idx]:
+                for aid in ids:
+                    shard.pop(aid, None)
     
     def clear(self) -> None:
         """Limpiar cache"""
-        self._cache.clear()
+        for shard, lock in zip(self._shards, self._locks):
+            with lock:
+                shard.clear()
     
     @property
     def size(self) -> int:
-        return len(self._cache)
+        return sum(len(shard) for shard in self._shards)
+    
+    @property
+    def ttl(self) -> int:
+        """Tiempo de vida de cada entrada, en segundos"""
+        return self._ttl_seconds
 
 
 # Instancia global del cache
 _score_cache = ScoreCache()
 
 
+def get_score_cache() -> ScoreCache:
+    """Cache de scores compartido por el proceso"""
+    return _score_cache
+
+
+_scorer: Optional[AttractionScorer] = None
+
+
+def get_scorer() -> AttractionScorer:
+    """Scorer compartido por el proceso (el modelo se carga en la primera llamada)"""
+    global _scorer
+    if _scorer is None:
+        _scorer = AttractionScorer()
+    return _scorer
+
+
 def get_attraction_scores(
     db: Session,
     attraction_ids: List[int],
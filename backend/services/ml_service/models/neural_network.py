@@ -8,10 +8,16 @@ que representa qué tan "buena" es la atracción.
 
 Este score es usado por BFS y A* para priorizar qué atracciones visitar.
 """
+import copy
+import io
+import os
+import tempfile
+import threading
+from functools import partial
 import torch
 import torch.nn as nn
 import torch.nn.functional as F
-from typing import List, Dict, Tuple, Optional
+from typing import Callable, List, Dict, Tuple, Optional, Union
 import numpy as np
 from pathlib import Path
 
@@ -21,6 +27,38 @@ from shared.config.settings import get_settings
 logger = setup_logger(__name__)
 settings = get_settings()
 
+# Recíprocos precalculados: la normalización multiplica en vez de dividir
+_INV_MAX_REVIEWS_LOG = np.float32(1.0 / np.log(10000 + 1))
+_INV_MAX_CHECKINS_LOG = np.float32(1.0 / np.log(100000 + 1))
+_INV5 = np.float32(0.2)
+_INV10 = np.float32(0.1)
+_INV100 = np.float32(0.01)
+
+# Columnas con escala lineal y recorte: un solo np.clip con límites por
+# columna (los ratings sólo se recortan por arriba, como antes)
+_LINEAR_COLS = np.array([0, 2, 4, 5, 8, 9, 12])
+_LINEAR_SCALE = np.array([_INV5, _INV5, _INV10, 1.0, _INV100, 1.0, 1.0], dtype=np.float64)
+_LINEAR_LOW = np.array([-np.inf, -np.inf, -np.inf, 0.0, -np.inf, 0.0, 0.0])
+# Columnas log-normalizadas: total_reviews, google_reviews, foursquare_checkins
+_LOG_COLS = np.array([1, 3, 6])
+_LOG_SCALE = np.array([_INV_MAX_REVIEWS_LOG, _INV_MAX_REVIEWS_LOG, _INV_MAX_CHECKINS_LOG], dtype=np.float64)
+
+
+# Buffers de entrada (1, 13) para predict_single, uno por hilo y dispositivo
+_single_buffers = threading.local()
+
+
+def _single_input_buffer(device: torch.device) -> torch.Tensor:
+    """Buffer (1, 13) reutilizable del hilo actual en `device`"""
+    buffers = getattr(_single_buffers, "by_device", None)
+    if buffers is None:
+        buffers = _single_buffers.by_device = {}
+    buf = buffers.get(device)
+    if buf is None:
+        # Se crea fuera de inference_mode para poder reescribirlo siempre
+        buf = buffers[device] = torch.zeros(1, AttractionScorerNetwork.INPUT_SIZE, device=device)
+    return buf
+
 
 class AttractionScorerNetwork(nn.Module):
     """
@@ -51,6 +89,18 @@ class AttractionScorerNetwork(nn.Module):
     
     # Constantes para normalización
     INPUT_SIZE = 13
+    
+    # Orden de las columnas en las versiones vectorizadas (arrays (N, 13))
+    FEATURE_NAMES = (
+        "rating", "total_reviews", "google_rating", "google_reviews",
+        "foursquare_rating", "foursquare_popularity", "foursquare_checkins",
+        "sentiment_score", "sentiment_positive_pct", "price_level",
+        "has_accessibility", "is_verified", "category_encoded"
+    )
+    # Valor usado si falta la característica (mismos defaults que normalize_features)
+    FEATURE_DEFAULTS = (0, 0, 0, 0, 0, 0, 0, 0, 50, 0.5, 0, 0, 0.5)
+    # Pares (nombre, default) precalculados para leer los diccionarios
+    _FEATURE_KEYS = tuple(zip(FEATURE_NAMES, FEATURE_DEFAULTS))
     MAX_REVIEWS_LOG = np.log(10000 + 1)  # Para normalizar reviews
     MAX_CHECKINS_LOG = np.log(100000 + 1)  # Para normalizar checkins
     
@@ -90,15 +140,18 @@ class AttractionScorerNetwork(nn.Module):
                 if m.bias is not None:
                     nn.init.zeros_(m.bias)
     
-    def forward(self, x: torch.Tensor) -> torch.Tensor:
+    def forward(self, x: torch.Tensor, inference_raw: bool = False) -> torch.Tensor:
         """
         Forward pass
         
         Args:
             x: Tensor de shape (batch_size, 13)
+            inference_raw: Devolver el logit sin Sigmoid. La sigmoide es
+                monótona, así que el orden es el mismo: sirve cuando sólo
+                se necesita ordenar atracciones
         
         Returns:
-            Tensor de shape (batch_size, 1) con scores 0-1
+            Tensor de shape (batch_size, 1) con scores 0-1 (o logits)
         """
         # Capa 1
         x = self.fc1(x)
@@ -119,6 +172,8 @@ class AttractionScorerNetwork(nn.Module):
         
         # Output con Sigmoid para score 0-1
         x = self.fc_out(x)
+        if inference_raw:
+            return x
         x = torch.sigmoid(x)
         
         return x
@@ -128,58 +183,210 @@ class AttractionScorerNetwork(nn.Module):
         """
         Normalizar características al rango esperado por la red
         
+        Reglas por columna (ver normalize_features_array):
+        ratings a 0-1 según su escala, reviews/checkins log-normalizados,
+        sentiment de -1..1 a 0..1, binarios a 0/1 y el resto recortado a 0-1.
+        
         Args:
             features: Diccionario de características (de attraction.get_features_for_nn())
         
         Returns:
-            Array numpy de 13 elementos normalizados
+            Array numpy float32 de 13 elementos normalizados
         """
-        normalized = np.zeros(AttractionScorerNetwork.INPUT_SIZE)
+        cls = AttractionScorerNetwork
+        raw = np.fromiter(
+            (features.get(name, default) for name, default in cls._FEATURE_KEYS),
+            dtype=np.float64,
+            count=cls.INPUT_SIZE
+        )
+        return cls.normalize_features_array(raw.reshape(1, cls.INPUT_SIZE))[0]
+    
+    @staticmethod
+    def normalize_features_batch(features_list: List[Dict[str, float]]) -> np.ndarray:
+        """
+        Normalizar una lista de diccionarios de características de una vez
         
-        # 1. Rating principal (0-5 → 0-1)
-        normalized[0] = min(features.get("rating", 0) / 5.0, 1.0)
+        Returns:
+            Array (N, 13) float32
+        """
+        cls = AttractionScorerNetwork
+        return cls.normalize_features_array(cls.features_to_array(features_list))
+    
+    @staticmethod
+    def features_to_array(features_list: List[Dict[str, float]]) -> np.ndarray:
+        """
+        Apilar diccionarios de características en un array crudo (N, 13)
+        en el orden de FEATURE_NAMES
+        """
+        cls = AttractionScorerNetwork
+        n = len(features_list)
+        flat = np.fromiter(
+            (
+                f.get(name, default)
+                for f in features_list
+                for name, default in cls._FEATURE_KEYS
+            ),
+            dtype=np.float64,
+            count=n * cls.INPUT_SIZE
+        )
+        return flat.reshape(n, cls.INPUT_SIZE)
+    
+    @staticmethod
+    def normalize_features_array(raw: np.ndarray) -> np.ndarray:
+        """
+        Versión vectorizada de `normalize_features`
         
-        # 2. Total reviews (log normalizado)
-        reviews = max(features.get("total_reviews", 0), 0)
-        normalized[1] = np.log(reviews + 1) / AttractionScorerNetwork.MAX_REVIEWS_LOG
+        Args:
+            raw: Array (N, 13) de características crudas en el orden de FEATURE_NAMES
         
-        # 3. Google rating (0-5 → 0-1)
-        normalized[2] = min(features.get("google_rating", 0) / 5.0, 1.0)
+        Returns:
+            Array (N, 13) float32 normalizado (mismas reglas que normalize_features)
+        """
+        raw = np.asarray(raw, dtype=np.float64)
+        out = np.empty(raw.shape, dtype=np.float32)
         
-        # 4. Google reviews (log normalizado)
-        g_reviews = max(features.get("google_reviews", 0), 0)
-        normalized[3] = np.log(g_reviews + 1) / AttractionScorerNetwork.MAX_REVIEWS_LOG
+        linear = raw[:, _LINEAR_COLS] * _LINEAR_SCALE
+        out[:, _LINEAR_COLS] = np.clip(linear, _LINEAR_LOW, 1.0, out=linear)
+        logs = np.maximum(raw[:, _LOG_COLS], 0)
+        out[:, _LOG_COLS] = np.log1p(logs, out=logs) * _LOG_SCALE
+        out[:, 7] = (raw[:, 7] + 1) * 0.5
+        out[:, 10:12] = raw[:, 10:12] != 0
         
-        # 5. Foursquare rating (0-10 → 0-1)
-        normalized[4] = min(features.get("foursquare_rating", 0) / 10.0, 1.0)
+        return out
+    
+    @staticmethod
+    def _fuse_linear_bn(fc: nn.Linear, bn: nn.BatchNorm1d) -> nn.Linear:
+        """Linear equivalente a `bn(fc(x))` con las estadísticas de eval"""
+        scale = bn.weight / torch.sqrt(bn.running_var + bn.eps)
+        fused = nn.Linear(fc.in_features, fc.out_features).to(fc.weight.device)
+        fused.weight.copy_(fc.weight * scale[:, None])
+        fused.bias.copy_((fc.bias - bn.running_mean) * scale + bn.bias)
+        return fused
+    
+    @torch.no_grad()
+    def fuse_for_inference(self) -> None:
+        """
+        Plegar cada BatchNorm1d en la Linear anterior (sólo inferencia)
         
-        # 6. Foursquare popularity (ya es 0-1)
-        normalized[5] = min(max(features.get("foursquare_popularity", 0), 0), 1.0)
+        En eval BatchNorm es una transformación afín fija, así que se
+        integra en los pesos y bias de la Linear y queda como Identity:
+        tres operaciones y tres tensores intermedios menos por forward.
+        Después de esto el modelo no debe entrenarse ni guardarse como
+        checkpoint (el state_dict ya no tiene las capas bn*).
+        """
+        self.eval()
+        for fc_name, bn_name in (("fc1", "bn1"), ("fc2", "bn2"), ("fc3", "bn3")):
+            bn = getattr(self, bn_name)
+            if isinstance(bn, nn.Identity):
+                continue
+            setattr(self, fc_name, self._fuse_linear_bn(getattr(self, fc_name), bn))
+            setattr(self, bn_name, nn.Identity())
+        
+        # El trace cacheado apunta a las capas anteriores
+        self.__dict__.pop("_traced_module", None)
+    
+    def quantize(self) -> "AttractionScorerNetwork":
+        """
+        Copia con las capas Linear cuantizadas a int8 (cuantización dinámica)
         
-        # 7. Foursquare checkins (log normalizado)
-        checkins = max(features.get("foursquare_checkins", 0), 0)
-        normalized[6] = np.log(checkins + 1) / AttractionScorerNetwork.MAX_CHECKINS_LOG
+        Sólo para inferencia en CPU: pliega BatchNorm en la copia y usa el
+        backend fbgemm (x86) si está disponible. El modelo float32 no se
+        modifica (sigue pudiendo entrenarse y guardarse). La copia queda
+        guardada y `predict_single`/`predict_batch` la prefieren a los
+        pesos float32.
         
-        # 8. Sentiment score (-1 a 1 → 0 a 1)
-        sentiment = features.get("sentiment_score", 0)
-        normalized[7] = (sentiment + 1) / 2.0
+        Returns:
+            El modelo cuantizado
+        """
+        if "fbgemm" in torch.backends.quantized.supported_engines:
+            torch.backends.quantized.engine = "fbgemm"
+        
+        # Sin los módulos cacheados en la copia (el trace se rehace al usarse)
+        self.__dict__.pop("_traced_module", None)
+        self.__dict__.pop("_quantized_module", None)
+        fused = copy.deepcopy(self)
+        fused.fuse_for_inference()
+        quantized = torch.ao.quantization.quantize_dynamic(
+            fused, {nn.Linear}, dtype=torch.qint8, inplace=True
+        )
+        object.__setattr__(self, "_quantized_module", quantized)
+        return quantized
+    
+    def export_onnx(self, path: Union[str, io.BytesIO], opset: int = 17) -> Union[str, io.BytesIO]:
+        """
+        Exportar la red (modo eval) a ONNX con tamaño de batch dinámico
+        
+        Entrada `x` (batch, 13) y salida `score` (batch, 1); se usa con
+        ONNX Runtime en AttractionScorer.
         
-        # 9. Sentiment positive % (0-100 → 0-1)
-        normalized[8] = min(features.get("sentiment_positive_pct", 50) / 100.0, 1.0)
+        Args:
+            path: Ruta del archivo o buffer en memoria (io.BytesIO)
         
-        # 10. Price level (ya es 0-1)
-        normalized[9] = min(max(features.get("price_level", 0.5), 0), 1.0)
+        Returns:
+            La ruta o el buffer recibidos
+        """
+        if isinstance(path, str):
+            Path(path).parent.mkdir(parents=True, exist_ok=True)
         
-        # 11. Has accessibility (0 o 1)
-        normalized[10] = 1.0 if features.get("has_accessibility", 0) else 0.0
+        param = next(self.parameters(), None)
+        device = param.device if param is not None else torch.device("cpu")
+        example = torch.zeros(1, self.INPUT_SIZE, device=device)
+        with torch.no_grad():
+            torch.onnx.export(
+                self.eval(),
+                example,
+                path,
+                input_names=["x"],
+                output_names=["score"],
+                dynamic_axes={"x": {0: "batch"}, "score": {0: "batch"}},
+                opset_version=opset
+            )
+        
+        if isinstance(path, str):
+            logger.info(f"Modelo exportado a ONNX: {path}")
+        return path
+    
+    def _ensure_traced(self) -> nn.Module:
+        """
+        Módulo TorchScript (trace) para inferencia, creado en el primer uso
         
-        # 12. Is verified (0 o 1)
-        normalized[11] = 1.0 if features.get("is_verified", 0) else 0.0
+        El grafo no cambia entre llamadas y la red es tan pequeña que el
+        dispatch de Python por operación domina la latencia. Todas las
+        operaciones aceptan cualquier tamaño de batch, así que basta un
+        trace con batch 1. Si el trace falla se usa el modelo eager.
         
-        # 13. Category encoded (ya es 0-1)
-        normalized[12] = min(max(features.get("category_encoded", 0.5), 0), 1.0)
+        Se guarda fuera de `_modules` para no meterlo en el state_dict;
+        comparte parámetros y buffers con la red, así que ve los pesos
+        actualizados por entrenamiento o `load_state_dict`. Si hay una
+        copia cuantizada (ver `quantize`) se traza esa.
+        """
+        traced = self.__dict__.get("_traced_module")
+        if traced is None:
+            module = self.__dict__.get("_quantized_module") or self
+            try:
+                param = next(self.parameters(), None)
+                device = param.device if param is not None else torch.device("cpu")
+                example = torch.zeros(1, self.INPUT_SIZE, device=device)
+                with torch.no_grad():
+                    traced = torch.jit.trace(module.eval(), example)
+            except Exception as e:
+                logger.warning(f"No se pudo trazar la red, usando modo eager: {str(e)}")
+                traced = module
+            object.__setattr__(self, "_traced_module", traced)
+        return traced
+    
+    def _inference_module(self) -> nn.Module:
+        """
+        Módulo para predecir, sin recorrer el árbol con `eval()` en cada llamada
         
-        return normalized
+        El trace queda fijado en modo eval (BatchNorm con estadísticas de
+        entrenamiento, Dropout apagado) aunque después la red vuelva a
+        `train()`; sólo el fallback eager necesita revisar el flag.
+        """
+        module = self._ensure_traced()
+        if module.training:
+            module.eval()
+        return module
     
     def predict_single(self, features: Dict[str, float]) -> float:
         """
@@ -191,29 +398,45 @@ class AttractionScorerNetwork(nn.Module):
         Returns:
             Score entre 0 y 1
         """
-        self.eval()
-        with torch.no_grad():
+        # El trace se crea (si hace falta) fuera de inference_mode
+        module = self._inference_module()
+        param = next(self.parameters(), None)
+        x = _single_input_buffer(param.device if param is not None else torch.device("cpu"))
+        with torch.inference_mode():
             normalized = self.normalize_features(features)
-            x = torch.FloatTensor(normalized).unsqueeze(0)  # (1, 13)
-            score = self(x)
+            x[0].copy_(torch.from_numpy(normalized))  # (1, 13), sin reservar
+            score = module(x)
             return float(score.item())
     
-    def predict_batch(self, features_list: List[Dict[str, float]]) -> List[float]:
+    def predict_batch(
+        self,
+        features_list: List[Dict[str, float]],
+        ranking_only: bool = False
+    ) -> List[float]:
         """
         Predecir scores para múltiples atracciones
         
         Args:
             features_list: Lista de diccionarios de características
+            ranking_only: Devolver logits (mismo orden que los scores,
+                sin la Sigmoid) cuando sólo se va a ordenar
         
         Returns:
-            Lista de scores
+            Lista de scores (o logits si ranking_only)
         """
-        self.eval()
-        with torch.no_grad():
-            batch = np.array([self.normalize_features(f) for f in features_list])
-            x = torch.FloatTensor(batch)
-            scores = self(x)
-            return [float(s.item()) for s in scores]
+        if ranking_only:
+            # El trace fija inference_raw=False: el camino crudo va en eager
+            if self.training:
+                self.eval()
+            module = partial(self.__dict__.get("_quantized_module") or self, inference_raw=True)
+        else:
+            module = self._inference_module()
+        
+        with torch.inference_mode():
+            x = torch.from_numpy(self.normalize_features_batch(features_list))
+            scores = module(x)
+            # Una sola copia a host en vez de un .item() por score
+            return scores.squeeze(-1).cpu().tolist()
 
 
 class AttractionScorerTrainer:
@@ -225,16 +448,39 @@ class AttractionScorerTrainer:
         self,
         model: Optional[AttractionScorerNetwork] = None,
         learning_rate: float = 0.001,
-        device: str = "cpu"
+        device: str = "cpu",
+        compile: bool = False
     ):
+        """
+        Args:
+            model: Red a entrenar (por defecto una nueva)
+            learning_rate: Tasa de aprendizaje de Adam
+            device: Dispositivo de entrenamiento
+            compile: Compilar el paso de entrenamiento con torch.compile.
+                Sólo compensa con batches grandes (>= 64) de tamaño fijo;
+                validación, guardado e inferencia siguen con el modelo eager
+        """
         self.device = torch.device(device)
         self.model = model or AttractionScorerNetwork()
         self.model.to(self.device)
         
+        # `self.model` es siempre el modelo eager (state_dict sin el prefijo
+        # `_orig_mod.` del compilado); el compilado comparte sus parámetros
+        self._train_forward = self.model
+        if compile:
+            self._train_forward = torch.compile(
+                self.model, mode="max-autotune", dynamic=False, fullgraph=True
+            )
+        
+        # Paso del optimizador en un solo kernel multi-tensor:
+        # fused en CUDA, foreach en CPU
+        use_fused = self.device.type == "cuda"
         self.optimizer = torch.optim.Adam(
             self.model.parameters(),
             lr=learning_rate,
-            weight_decay=1e-5  # L2 regularization
+            weight_decay=1e-5,  # L2 regularization
+            fused=use_fused,
+            foreach=not use_fused
         )
         
         # MSE Loss para regresión
@@ -251,6 +497,11 @@ class AttractionScorerTrainer:
         """
         Entrenar una época
         
+        Con device cuda, `train_loader` debe venir de
+        DatasetLoader.create_dataloaders (pin_memory y workers
+        persistentes) o de create_tensor_loaders con los tensores ya en
+        el dispositivo, para que las copias no bloqueen el cómputo.
+        
         Returns:
             Pérdida promedio de la época
         """
@@ -258,20 +509,22 @@ class AttractionScorerTrainer:
         total_loss = 0.0
         num_batches = 0
         
+        # non_blocking: con pin_memory en el DataLoader la copia a GPU es asíncrona
         for batch_x, batch_y in train_loader:
-            batch_x = batch_x.to(self.device)
-            batch_y = batch_y.to(self.device)
+            batch_x = batch_x.to(self.device, non_blocking=True)
+            batch_y = batch_y.to(self.device, non_blocking=True)
             
             # Forward
-            self.optimizer.zero_grad()
-            predictions = self.model(batch_x)
+            # set_to_none: sin memset de los gradientes en cada paso
+            self.optimizer.zero_grad(set_to_none=True)
+            predictions = self._train_forward(batch_x)
             loss = self.criterion(predictions, batch_y)
             
             # Backward
             loss.backward()
             
             # Gradient clipping para estabilidad
-            torch.nn.utils.clip_grad_norm_(self.model.parameters(), max_norm=1.0)
+            torch.nn.utils.clip_grad_norm_(self.model.parameters(), max_norm=1.0, foreach=True)
             
             self.optimizer.step()
             
@@ -295,10 +548,10 @@ class AttractionScorerTrainer:
         total_mae = 0.0
         num_batches = 0
         
-        with torch.no_grad():
+        with torch.inference_mode():
             for batch_x, batch_y in val_loader:
-                batch_x = batch_x.to(self.device)
-                batch_y = batch_y.to(self.device)
+                batch_x = batch_x.to(self.device, non_blocking=True)
+                batch_y = batch_y.to(self.device, non_blocking=True)
                 
                 predictions = self.model(batch_x)
                 loss = self.criterion(predictions, batch_y)
@@ -319,7 +572,8 @@ class AttractionScorerTrainer:
         val_loader: Optional[torch.utils.data.DataLoader] = None,
         epochs: int = 100,
         early_stopping_patience: int = 10,
-        save_best: bool = True
+        save_best: bool = True,
+        progress_callback: Optional[Callable[[int, float, float], None]] = None
     ) -> Dict[str, List[float]]:
         """
         Entrenar el modelo completo
@@ -330,15 +584,57 @@ class AttractionScorerTrainer:
             epochs: Número de épocas
             early_stopping_patience: Épocas sin mejora antes de parar
             save_best: Guardar mejor modelo
+            progress_callback: Llamada al final de cada época con
+                (época, train_loss, val_loss)
         
         Returns:
             Historial de entrenamiento
         """
         logger.info(f"Iniciando entrenamiento: {epochs} épocas")
         
+        # El mejor estado va a un archivo temporal en vez de a una copia en
+        # RAM: las mejoras son poco frecuentes y no duplica la memoria
+        best_state_path = None
+        if save_best and val_loader:
+            fd, best_state_path = tempfile.mkstemp(prefix="attraction_scorer_best_", suffix=".pt")
+            os.close(fd)
+        
+        try:
+            best_val_loss = self._train_loop(
+                train_loader, val_loader, epochs, early_stopping_patience,
+                best_state_path, progress_callback
+            )
+            
+            # Restaurar mejor modelo
+            if best_state_path and os.path.getsize(best_state_path) > 0:
+                self.model.load_state_dict(torch.load(best_state_path, map_location=self.device))
+                logger.info(f"Modelo restaurado a mejor validación: {best_val_loss:.4f}")
+        finally:
+            if best_state_path:
+                os.remove(best_state_path)
+        
+        return {
+            "train_losses": self.train_losses,
+            "val_losses": self.val_losses
+        }
+    
+    def _train_loop(
+        self,
+        train_loader: torch.utils.data.DataLoader,
+        val_loader: Optional[torch.utils.data.DataLoader],
+        epochs: int,
+        early_stopping_patience: int,
+        best_state_path: Optional[str],
+        progress_callback: Optional[Callable[[int, float, float], None]] = None
+    ) -> float:
+        """
+        Épocas con early stopping; cada mejora se guarda en `best_state_path`
+        
+        Returns:
+            Mejor pérdida de validación (inf sin validación)
+        """
         best_val_loss = float('inf')
         patience_counter = 0
-        best_model_state = None
         
         for epoch in range(epochs):
             # Entrenar
@@ -355,14 +651,20 @@ class AttractionScorerTrainer:
                 if val_loss < best_val_loss:
                     best_val_loss = val_loss
                     patience_counter = 0
-                    if save_best:
-                        best_model_state = self.model.state_dict().copy()
+                    if best_state_path:
+                        torch.save(
+                            {k: v.detach().cpu() for k, v in self.model.state_dict().items()},
+                            best_state_path
+                        )
                 else:
                     patience_counter += 1
-                
-                if patience_counter >= early_stopping_patience:
-                    logger.info(f"Early stopping en época {epoch + 1}")
-                    break
+            
+            if progress_callback is not None:
+                progress_callback(epoch + 1, train_loss, val_loss)
+            
+            if val_loader and patience_counter >= early_stopping_patience:
+                logger.info(f"Early stopping en época {epoch + 1}")
+                break
             
             # Log cada 10 épocas
             if (epoch + 1) % 10 == 0:
@@ -373,15 +675,7 @@ class AttractionScorerTrainer:
                     f"Val MAE: {val_mae:.4f}"
                 )
         
-        # Restaurar mejor modelo
-        if best_model_state and save_best:
-            self.model.load_state_dict(best_model_state)
-            logger.info(f"Modelo restaurado a mejor validación: {best_val_loss:.4f}")
-        
-        return {
-            "train_losses": self.train_losses,
-            "val_losses": self.val_losses
-        }
+        return best_val_loss
     
     def save_model(self, path: Optional[str] = None) -> str:
         """
@@ -409,12 +703,41 @@ class AttractionScorerTrainer:
         logger.info(f"Modelo guardado en: {save_path}")
         return save_path
     
-    def load_model(self, path: Optional[str] = None) -> None:
+    def save_quantized(self, path: Optional[str] = None) -> str:
+        """
+        Guardar la versión int8 del modelo como TorchScript
+        
+        Se guarda aparte del checkpoint float32 (que sigue siendo el que
+        se usa para reentrenar) y se carga con `torch.jit.load`.
+        
+        Args:
+            path: Ruta donde guardar (por defecto junto al modelo, `.int8.pt`)
+        
+        Returns:
+            Ruta donde se guardó
+        """
+        save_path = path or str(Path(settings.NN_MODEL_SAVE_PATH).with_suffix(".int8.pt"))
+        Path(save_path).parent.mkdir(parents=True, exist_ok=True)
+        
+        # Cuantizar una copia en CPU: el modelo entrenado no cambia de
+        # dispositivo ni pasa a preferir la versión int8 en sus predicciones
+        model = copy.deepcopy(self.model).cpu()
+        quantized = model.quantize()
+        example = torch.zeros(1, AttractionScorerNetwork.INPUT_SIZE)
+        with torch.no_grad():
+            torch.jit.save(torch.jit.trace(quantized, example), save_path)
+        
+        logger.info(f"Modelo cuantizado guardado en: {save_path}")
+        return save_path
+    
+    def load_model(self, path: Optional[str] = None, for_inference: bool = False) -> None:
         """
         Cargar modelo entrenado
         
         Args:
             path: Ruta del modelo
+            for_inference: Dejar el modelo en eval con BatchNorm plegado
+                (ver AttractionScorerNetwork.fuse_for_inference)
         """
         load_path = path or settings.NN_MODEL_SAVE_PATH
         
@@ -428,6 +751,8 @@ class AttractionScorerTrainer:
         self.model = AttractionScorerNetwork(hidden_size=hidden_size)
         self.model.load_state_dict(checkpoint['model_state_dict'])
         self.model.to(self.device)
+        if for_inference:
+            self.model.fuse_for_inference()
         
         if 'optimizer_state_dict' in checkpoint:
             self.optimizer.load_state_dict(checkpoint['optimizer_state_dict'])
@@ -454,50 +779,53 @@ def create_target_score(features: Dict[str, float]) -> float:
         features: Características de la atracción
     
     Returns:
-        Score objetivo entre 0 y 1
+        Score objetivo entre 0 y 1 (calculado con create_target_score_array)
     """
-    score = 0.0
+    raw = AttractionScorerNetwork.features_to_array([features])
+    return float(create_target_score_array(raw)[0])
+
+
+def create_target_score_array(raw: np.ndarray) -> np.ndarray:
+    """
+    Versión vectorizada de `create_target_score`
     
-    # Rating (30%) - Promedio de todas las fuentes
-    ratings = []
-    if features.get("rating", 0) > 0:
-        ratings.append(features["rating"] / 5.0)
-    if features.get("google_rating", 0) > 0:
-        ratings.append(features["google_rating"] / 5.0)
-    if features.get("foursquare_rating", 0) > 0:
-        ratings.append(features["foursquare_rating"] / 10.0)
+    Args:
+        raw: Array (N, 13) de características crudas en el orden de
+            AttractionScorerNetwork.FEATURE_NAMES
     
-    if ratings:
-        score += 0.30 * (sum(ratings) / len(ratings))
+    Returns:
+        Array (N,) con scores objetivo entre 0 y 1
+    """
+    raw = np.asarray(raw, dtype=np.float64)
+    rating, total_reviews, google_rating = raw[:, 0], raw[:, 1], raw[:, 2]
+    fsq_rating, fsq_popularity, fsq_checkins = raw[:, 4], raw[:, 5], raw[:, 6]
     
-    # Popularidad (25%)
-    popularity = 0.0
-    if features.get("total_reviews", 0) > 0:
-        # Log scale para reviews
-        popularity += 0.4 * min(np.log(features["total_reviews"] + 1) / np.log(1000), 1.0)
-    if features.get("foursquare_popularity", 0) > 0:
-        popularity += 0.3 * features["foursquare_popularity"]
-    if features.get("foursquare_checkins", 0) > 0:
-        popularity += 0.3 * min(np.log(features["foursquare_checkins"] + 1) / np.log(10000), 1.0)
+    # Rating (30%) - Promedio de las fuentes con valor > 0
+    rating_parts = np.stack([rating / 5.0, google_rating / 5.0, fsq_rating / 10.0], axis=1)
+    rating_mask = np.stack([rating > 0, google_rating > 0, fsq_rating > 0], axis=1)
+    rating_count = rating_mask.sum(axis=1)
+    rating_sum = np.where(rating_mask, rating_parts, 0.0).sum(axis=1)
+    score = 0.30 * np.divide(rating_sum, rating_count, out=np.zeros_like(rating_sum), where=rating_count > 0)
     
+    # Popularidad (25%)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        reviews_term = np.minimum(np.log(total_reviews + 1) / np.log(1000), 1.0)
+        checkins_term = np.minimum(np.log(fsq_checkins + 1) / np.log(10000), 1.0)
+    popularity = (
+        np.where(total_reviews > 0, 0.4 * reviews_term, 0.0)
+        + np.where(fsq_popularity > 0, 0.3 * fsq_popularity, 0.0)
+        + np.where(fsq_checkins > 0, 0.3 * checkins_term, 0.0)
+    )
     score += 0.25 * popularity
     
     # Sentiment (20%)
-    sentiment = features.get("sentiment_positive_pct", 50) / 100.0
-    score += 0.20 * sentiment
+    score += 0.20 * (raw[:, 8] / 100.0)
     
     # Verificado y accesible (10%)
-    quality = 0.0
-    if features.get("is_verified", 0):
-        quality += 0.5
-    if features.get("has_accessibility", 0):
-        quality += 0.5
-    score += 0.10 * quality
-    
-    # Precio (15%) - Preferir opciones accesibles pero no gratis
-    price = features.get("price_level", 0.5)
-    # Función que penaliza extremos (muy caro o gratis)
-    price_score = 1.0 - abs(price - 0.4) * 2  # Óptimo en 0.4 (bajo-medio)
-    score += 0.15 * max(0, min(price_score, 1.0))
-    
-    return min(max(score, 0.0), 1.0)
+    score += 0.10 * (0.5 * (raw[:, 11] != 0) + 0.5 * (raw[:, 10] != 0))
+    
+    # Precio (15%) - Óptimo en 0.4 (bajo-medio)
+    price_score = 1.0 - np.abs(raw[:, 9] - 0.4) * 2
+    score += 0.15 * np.clip(price_score, 0, 1.0)
+    
+    return np.clip(score, 0.0, 1.0)
@@ -0,0 +1,104 @@
+# backend/services/ml_service/models/training.py
+"""
+Entrenamiento de la red fuera del proceso de la API
+
+`run_training` se ejecuta en un proceso aparte (ProcessPoolExecutor): el
+bucle de entrenamiento retiene el GIL y, dentro del worker de FastAPI,
+bloquearía el resto de peticiones. Sólo recibe y devuelve datos
+serializables; el avance por época se publica en un diccionario
+compartido (multiprocessing.Manager).
+"""
+from typing import Any, Dict, Optional
+
+from shared.utils.logger import setup_logger
+from .neural_network import AttractionScorerTrainer
+
+logger = setup_logger(__name__)
+
+# Épocas entre publicaciones del avance al proceso de la API
+PROGRESS_EVERY = 5
+
+
+def run_training(config: Dict[str, Any], progress: Optional[Dict] = None) -> Dict[str, float]:
+    """
+    Cargar datos, entrenar y guardar el modelo
+
+    Args:
+        config: Campos de TrainingConfig (epochs, batch_size, learning_rate,
+            use_synthetic, min_samples, validation_split)
+        progress: Diccionario compartido donde se escriben epoch,
+            train_loss, val_loss y best_val_loss cada PROGRESS_EVERY épocas
+
+    Returns:
+        Métricas finales del entrenamiento
+
+    Raises:
+        ValueError: Si no hay datos suficientes para entrenar
+    """
+    from shared.database import SessionLocal
+    from ..data.dataset_loader import DatasetLoader, SyntheticDataGenerator
+
+    db = SessionLocal()
+    try:
+        loader = DatasetLoader(db)
+        try:
+            features, targets = loader.prepare_training_data(augment_data=True)
+        except ValueError:
+            features, targets = None, None
+
+        num_real = 0 if features is None else len(features)
+        if num_real < config["min_samples"] and config["use_synthetic"]:
+            logger.info(f"📊 Generando datos sintéticos (solo {num_real} muestras reales)")
+            features, targets = SyntheticDataGenerator.generate(
+                num_samples=config["min_samples"] * 2
+            )
+
+        if features is None or len(features) == 0:
+            raise ValueError("No hay datos suficientes para entrenar")
+
+        train_loader, val_loader = loader.create_dataloaders(
+            features=features,
+            targets=targets,
+            batch_size=config["batch_size"],
+            train_split=1 - config["validation_split"]
+        )
+    finally:
+        db.close()
+
+    trainer = AttractionScorerTrainer(learning_rate=config["learning_rate"])
+
+    # Cada escritura en el diccionario del Manager es un viaje IPC: se
+    # publica cada PROGRESS_EVERY épocas (y la última al terminar)
+    latest: Dict[str, float] = {"best_val_loss": float("inf")}
+
+    def publish() -> None:
+        if progress is not None and "epoch" in latest:
+            progress.update(latest)
+
+    def progress_callback(epoch: int, train_loss: float, val_loss: float) -> None:
+        latest["epoch"] = epoch
+        latest["train_loss"] = train_loss
+        latest["val_loss"] = val_loss
+        if val_loader:
+            latest["best_val_loss"] = min(latest["best_val_loss"], val_loss)
+        if epoch % PROGRESS_EVERY == 0:
+            publish()
+
+    history = trainer.train(
+        train_loader=train_loader,
+        val_loader=val_loader,
+        epochs=config["epochs"],
+        progress_callback=progress_callback
+    )
+    publish()
+    trainer.save_model()
+
+    train_losses = history["train_losses"]
+    val_losses = history["val_losses"]
+    return {
+        "final_train_loss": train_losses[-1] if train_losses else 0,
+        "final_val_loss": val_losses[-1] if val_losses else 0,
+        "best_val_loss": min(val_losses) if val_losses else 0,
+        "total_epochs": len(train_losses),
+        "samples_trained": len(features)
+    }
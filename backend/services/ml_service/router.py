@@ -12,40 +12,61 @@ Endpoints para el servicio de Machine Learning:
 ═══════════════════════════════════════════════════════════════════════════════
 """
 
+import asyncio
+import multiprocessing
+import time
+from concurrent.futures import ProcessPoolExecutor
+
 from fastapi import APIRouter, Depends, HTTPException, status, BackgroundTasks, Query
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import ORJSONResponse
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from typing import List, Optional, Dict, Any
-from pydantic import BaseModel, Field
+from typing import List, Optional, Dict, Any, Tuple
+from pydantic import BaseModel, ConfigDict, Field
 from datetime import datetime
 
-from shared.database import get_db
+from shared.database import SessionLocal, get_db, get_async_db
 from shared.database.models import Attraction, Destination
+from shared.config.settings import get_settings
 from shared.utils.logger import setup_logger
 from services.auth.dependencies import get_current_user, get_admin_user
 
-from .models.neural_network import AttractionScorerTrainer
+from .models.training import run_training
 from .models.inference import (
-    AttractionScorer, 
     ScoringService, 
-    ScoreCache,
-    get_attraction_scores
+    NN_FEATURE_COLUMNS,
+    get_score_cache,
+    get_scorer
 )
-from .data.dataset_loader import DatasetLoader, SyntheticDataGenerator
 
 logger = setup_logger(__name__)
+settings = get_settings()
 
 router = APIRouter(
     prefix="/ml",
     tags=["Machine Learning"],
-    responses={404: {"description": "Not found"}}
+    responses={404: {"description": "Not found"}},
+    default_response_class=ORJSONResponse
 )
 
+# Instancias compartidas del proceso (el modelo se carga en la primera petición)
+score_cache = get_score_cache()
+
 # ═══════════════════════════════════════════════════════════════════════════════
 #                              SCHEMAS
 # ═══════════════════════════════════════════════════════════════════════════════
 
+# Validadores construidos al importar (no en la primera petición); sin campos
+# extra. `model_*` son campos propios, no el namespace reservado de Pydantic.
+_SCHEMA_CONFIG = ConfigDict(extra='forbid', defer_build=False, protected_namespaces=())
+
+
 class TrainingConfig(BaseModel):
     """Configuración para entrenamiento"""
+    model_config = _SCHEMA_CONFIG
+    
     epochs: int = Field(default=100, ge=1, le=1000, description="Número de épocas")
     batch_size: int = Field(default=32, ge=8, le=256, description="Tamaño del batch")
     learning_rate: float = Field(default=0.001, ge=0.0001, le=0.1, description="Learning rate")
@@ -56,12 +77,16 @@ class TrainingConfig(BaseModel):
 
 class PredictionRequest(BaseModel):
     """Request para predicción de scores"""
-    attraction_ids: List[int] = Field(..., min_items=1, max_items=500, description="IDs de atracciones")
+    model_config = _SCHEMA_CONFIG
+    
+    attraction_ids: List[int] = Field(..., min_length=1, max_length=500, description="IDs de atracciones")
     use_cache: bool = Field(default=True, description="Usar cache si está disponible")
 
 
 class PredictionResponse(BaseModel):
     """Response con predicciones"""
+    model_config = _SCHEMA_CONFIG
+    
     scores: Dict[int, float] = Field(..., description="Diccionario ID -> Score")
     cached_count: int = Field(default=0, description="Cantidad obtenida de cache")
     predicted_count: int = Field(default=0, description="Cantidad predicha por el modelo")
@@ -70,12 +95,16 @@ class PredictionResponse(BaseModel):
 
 class UpdateScoresRequest(BaseModel):
     """Request para actualizar scores"""
+    model_config = _SCHEMA_CONFIG
+    
     destination_id: Optional[int] = Field(None, description="ID del destino (null = todos)")
     force_update: bool = Field(default=False, description="Forzar actualización de todos los scores")
 
 
 class UpdateScoresResponse(BaseModel):
     """Response de actualización"""
+    model_config = _SCHEMA_CONFIG
+    
     updated_count: int
     failed_count: int
     duration_seconds: float
@@ -84,6 +113,8 @@ class UpdateScoresResponse(BaseModel):
 
 class ModelStatusResponse(BaseModel):
     """Estado del modelo"""
+    model_config = _SCHEMA_CONFIG
+    
     model_loaded: bool
     model_path: str
     cache_size: int
@@ -94,6 +125,8 @@ class ModelStatusResponse(BaseModel):
 
 class TrainingStatusResponse(BaseModel):
     """Estado del entrenamiento"""
+    model_config = _SCHEMA_CONFIG
+    
     status: str  # "idle", "training", "completed", "failed"
     current_epoch: int = 0
     total_epochs: int = 0
@@ -128,6 +161,24 @@ class TrainingState:
         self.completed_at = None
         self.error_message = None
         self.final_metrics = None
+        self._progress = None
+    
+    def attach_progress(self, progress) -> None:
+        """Diccionario compartido donde el proceso de entrenamiento publica su avance"""
+        self._progress = progress
+    
+    def sync_progress(self) -> None:
+        """Traer el último avance publicado por el proceso de entrenamiento"""
+        if self._progress is None or self.status != "training":
+            return
+        try:
+            snapshot = dict(self._progress)
+        except Exception:  # el Manager ya no está disponible
+            return
+        if snapshot:
+            self.current_epoch = snapshot["epoch"]
+            self.current_loss = snapshot["train_loss"]
+            self.best_val_loss = snapshot["best_val_loss"]
     
     def start_training(self, total_epochs: int):
         self.status = "training"
@@ -146,11 +197,14 @@ class TrainingState:
             self.best_val_loss = val_loss
     
     def complete(self, metrics: Dict[str, float]):
+        self.sync_progress()
+        self._progress = None
         self.status = "completed"
         self.completed_at = datetime.utcnow()
         self.final_metrics = metrics
     
     def fail(self, error: str):
+        self._progress = None
         self.status = "failed"
         self.completed_at = datetime.utcnow()
         self.error_message = error
@@ -162,6 +216,39 @@ class TrainingState:
 training_state = TrainingState()
 
 
+# Segundos que se reutilizan los agregados de /statistics
+STATISTICS_TTL_SECONDS = 60
+
+
+class StatisticsCache:
+    """
+    Último resultado de los agregados de /statistics
+    
+    Son consultas sobre toda la tabla de atracciones y el endpoint se
+    consulta en polling desde dashboards: se reutilizan durante el TTL y se
+    invalidan cuando cambian los nn_score.
+    """
+    
+    def __init__(self, ttl_seconds: float = STATISTICS_TTL_SECONDS):
+        self._ttl_seconds = ttl_seconds
+        self._entry: Optional[Tuple[float, Dict[str, Any]]] = None
+    
+    def get(self) -> Optional[Dict[str, Any]]:
+        entry = self._entry
+        if entry is None or time.monotonic() - entry[0] >= self._ttl_seconds:
+            return None
+        return entry[1]
+    
+    def set(self, stats: Dict[str, Any]) -> None:
+        self._entry = (time.monotonic(), stats)
+    
+    def invalidate(self) -> None:
+        self._entry = None
+
+
+statistics_cache = StatisticsCache()
+
+
 # ═══════════════════════════════════════════════════════════════════════════════
 #                              ENDPOINTS
 # ═══════════════════════════════════════════════════════════════════════════════
@@ -177,14 +264,13 @@ async def get_model_status():
     - Estadísticas del cache
     - Métricas del último entrenamiento
     """
-    scorer = AttractionScorer()
-    cache = ScoreCache()
+    scorer = get_scorer()
     
     return ModelStatusResponse(
         model_loaded=scorer.model is not None,
-        model_path=scorer.model_path,
-        cache_size=len(cache._cache),
-        cache_ttl_minutes=int(cache.ttl / 60),
+        model_path=settings.NN_MODEL_SAVE_PATH,
+        cache_size=score_cache.size,
+        cache_ttl_minutes=int(score_cache.ttl / 60),
         last_training=training_state.completed_at,
         training_metrics=training_state.final_metrics
     )
@@ -197,6 +283,7 @@ async def get_training_status():
     
     Útil para polling durante entrenamiento largo
     """
+    training_state.sync_progress()
     return TrainingStatusResponse(
         status=training_state.status,
         current_epoch=training_state.current_epoch,
@@ -256,84 +343,56 @@ async def train_model(
     return {
         "message": "Entrenamiento iniciado",
         "total_attractions": total_attractions,
-        "config": config.dict(),
+        "config": config.model_dump(),
         "monitor_url": "/ml/training-status"
     }
 
 
+# Un solo entrenamiento a la vez, en un proceso aparte (spawn: no hereda
+# los hilos de PyTorch del proceso de la API). Se crean al primer uso
+_train_pool: Optional[ProcessPoolExecutor] = None
+_train_manager = None
+
+
+def _get_train_pool() -> ProcessPoolExecutor:
+    global _train_pool, _train_manager
+    if _train_pool is None:
+        context = multiprocessing.get_context("spawn")
+        _train_manager = context.Manager()
+        _train_pool = ProcessPoolExecutor(max_workers=1, mp_context=context)
+    return _train_pool
+
+
 async def _train_model_task(config: TrainingConfig, total_attractions: int):
     """
     Tarea de entrenamiento en background
-    """
-    from shared.database import SessionLocal
     
-    db = SessionLocal()
+    El entrenamiento corre en el pool de procesos (ver models/training.py);
+    aquí sólo se espera el resultado sin bloquear el event loop y, al
+    terminar, se recarga el modelo en este proceso.
+    """
     try:
         logger.info("🚀 Iniciando entrenamiento de red neuronal...")
         
-        # Cargar datos
-        loader = DatasetLoader(db)
-        train_loader, val_loader = loader.get_data_loaders(
-            batch_size=config.batch_size,
-            val_split=config.validation_split,
-            augment=True
-        )
-        
-        # Verificar si necesitamos datos sintéticos
-        train_size = len(train_loader.dataset) if train_loader else 0
-        
-        if train_size < config.min_samples and config.use_synthetic:
-            logger.info(f"📊 Generando datos sintéticos (solo {train_size} muestras reales)")
-            
-            generator = SyntheticDataGenerator()
-            synthetic_samples = config.min_samples * 2  # Generar el doble
-            
-            train_loader, val_loader = generator.generate_dataloaders(
-                num_samples=synthetic_samples,
-                batch_size=config.batch_size,
-                val_split=config.validation_split
-            )
-        
-        if not train_loader or len(train_loader.dataset) == 0:
-            training_state.fail("No hay datos suficientes para entrenar")
-            return
-        
-        # Crear trainer
-        trainer = AttractionScorerTrainer(
-            learning_rate=config.learning_rate
-        )
-        
-        # Callback para actualizar estado
-        def progress_callback(epoch: int, train_loss: float, val_loss: float):
-            training_state.update_progress(epoch, train_loss, val_loss)
+        pool = _get_train_pool()
+        progress = _train_manager.dict()
+        training_state.attach_progress(progress)
         
-        # Entrenar
-        history = trainer.train(
-            train_loader=train_loader,
-            val_loader=val_loader,
-            epochs=config.epochs,
-            progress_callback=progress_callback
+        metrics = await asyncio.get_running_loop().run_in_executor(
+            pool, run_training, config.model_dump(), progress
         )
         
-        # Guardar modelo
-        trainer.save_model()
-        
-        # Recargar modelo en el scorer singleton
-        scorer = AttractionScorer()
-        scorer._load_model()
+        # Recargar modelo en el scorer singleton (bloqueante: en el threadpool)
+        reloaded = await run_in_threadpool(get_scorer().reload_model)
         
         # Limpiar cache
-        cache = ScoreCache()
-        cache.clear()
+        score_cache.clear()
+        statistics_cache.invalidate()
         
-        # Métricas finales
-        metrics = {
-            "final_train_loss": history["train_loss"][-1] if history["train_loss"] else 0,
-            "final_val_loss": history["val_loss"][-1] if history["val_loss"] else 0,
-            "best_val_loss": min(history["val_loss"]) if history["val_loss"] else 0,
-            "total_epochs": len(history["train_loss"]),
-            "samples_trained": len(train_loader.dataset)
-        }
+        if not reloaded:
+            training_state.fail("Modelo entrenado y guardado, pero no se pudo recargar")
+            logger.error("❌ No se pudo recargar el modelo entrenado")
+            return
         
         training_state.complete(metrics)
         logger.info(f"✅ Entrenamiento completado: {metrics}")
@@ -341,14 +400,24 @@ async def _train_model_task(config: TrainingConfig, total_attractions: int):
     except Exception as e:
         logger.error(f"❌ Error en entrenamiento: {e}")
         training_state.fail(str(e))
-    finally:
-        db.close()
+
+
+async def _predict_scores_async(db: AsyncSession, attraction_ids: List[int]) -> Dict[int, float]:
+    """Como ScoringService.predict_scores, pero leyendo las features con AsyncSession"""
+    rows = []
+    chunk_size = ScoringService.SCORES_QUERY_CHUNK
+    for i in range(0, len(attraction_ids), chunk_size):
+        chunk = attraction_ids[i:i + chunk_size]
+        rows.extend((await db.execute(ScoringService.FEATURE_ROWS_STMT, {"ids": chunk})).all())
+    
+    ids, scores = get_scorer().predict_feature_rows(rows)
+    return dict(zip(ids, scores))
 
 
 @router.post("/predict", response_model=PredictionResponse)
 async def predict_scores(
     request: PredictionRequest,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Predecir scores para una lista de atracciones
@@ -360,13 +429,13 @@ async def predict_scores(
     """
     try:
         # Verificar que las atracciones existen
-        existing_ids = db.query(Attraction.id).filter(
-            Attraction.id.in_(request.attraction_ids)
-        ).all()
-        existing_ids = {row[0] for row in existing_ids}
+        requested_ids = set(request.attraction_ids)
+        existing_ids = set((await db.execute(
+            ScoringService.EXISTING_IDS_STMT, {"ids": list(requested_ids)}
+        )).scalars())
         
-        # Filtrar IDs válidos
-        valid_ids = [aid for aid in request.attraction_ids if aid in existing_ids]
+        # Filtrar IDs válidos (sin duplicados)
+        valid_ids = list(requested_ids & existing_ids)
         
         if not valid_ids:
             raise HTTPException(
@@ -375,33 +444,27 @@ async def predict_scores(
             )
         
         # Obtener scores
-        cache = ScoreCache()
         cached_count = 0
         predicted_count = 0
         
         if request.use_cache:
-            # Intentar obtener de cache primero
-            scores = {}
-            to_predict = []
-            
-            for aid in valid_ids:
-                cached = cache.get(aid)
-                if cached is not None:
-                    scores[aid] = cached
-                    cached_count += 1
-                else:
-                    to_predict.append(aid)
+            # Intentar obtener de cache primero (un lock por shard)
+            scores = score_cache.get_many(valid_ids)
+            cached_count = len(scores)
+            to_predict = [aid for aid in valid_ids if aid not in scores]
             
             # Predecir los que no están en cache
             if to_predict:
-                predicted = get_attraction_scores(db, to_predict, use_cache=False)
+                predicted = await _predict_scores_async(db, to_predict)
+                score_cache.set_many(predicted)
                 scores.update(predicted)
                 predicted_count = len(predicted)
         else:
-            scores = get_attraction_scores(db, valid_ids, use_cache=False)
+            # Una sola pasada batch por la red para todos los IDs
+            scores = await _predict_scores_async(db, valid_ids)
             predicted_count = len(scores)
         
-        scorer = AttractionScorer()
+        scorer = get_scorer()
         
         return PredictionResponse(
             scores=scores,
@@ -420,11 +483,93 @@ async def predict_scores(
         )
 
 
+# /update-scores reparte el trabajo entre varios workers, cada uno con su
+# propia sesión: mientras uno espera a la BD otro ejecuta el modelo
+UPDATE_SCORES_WORKERS = 4
+UPDATE_SCORES_BATCH_SIZE = 100
+
+
+def _update_scores_worker(
+    destination_id: Optional[int],
+    cutoff: Optional[datetime],
+    run_started: datetime
+) -> Tuple[int, int, List[str]]:
+    """
+    Actualizar batches de atracciones hasta que no queden pendientes
+    
+    Cada batch se lee por keyset (id > último id) con FOR UPDATE SKIP
+    LOCKED: los workers se reparten las filas sin coordinarse y la memoria
+    queda en O(batch_size). Commit por batch (un UPDATE por batch).
+    
+    Returns:
+        Tuple de (actualizadas, fallidas, errores)
+    """
+    db = SessionLocal()
+    try:
+        service = ScoringService(db)
+        
+        # Filtrar atracciones a actualizar (sólo id y columnas de features)
+        query = db.query(Attraction.id, *NN_FEATURE_COLUMNS).filter(
+            (Attraction.nn_score_updated_at == None) |
+            (Attraction.nn_score_updated_at < run_started)
+        )
+        
+        if destination_id:
+            query = query.filter(Attraction.destination_id == destination_id)
+        
+        if cutoff is not None:
+            query = query.filter(
+                (Attraction.nn_score == None) | 
+                (Attraction.nn_score_updated_at < cutoff)
+            )
+        
+        updated = 0
+        failed = 0
+        errors = []
+        last_id = 0
+        while True:
+            batch = query.filter(
+                Attraction.id > last_id
+            ).order_by(Attraction.id).limit(UPDATE_SCORES_BATCH_SIZE).with_for_update(
+                skip_locked=True
+            ).all()
+            if not batch:
+                break
+            last_id = batch[-1].id
+            
+            try:
+                count = service.update_rows_scores(batch)
+                # Commit cada batch
+                db.commit()
+                updated += count
+                # Sólo se invalidan los scores que cambiaron; el resto del
+                # cache sigue sirviendo a /predict
+                score_cache.invalidate_many([row.id for row in batch])
+            except Exception as e:
+                db.rollback()
+                failed += len(batch)
+                errors.append(
+                    f"Atracciones {batch[0].id}-{batch[-1].id}: {str(e)}"
+                )
+        
+        return updated, failed, errors
+    finally:
+        db.close()
+
+
+def _database_now() -> datetime:
+    """Reloj de la BD, con una sesión propia que se cierra enseguida"""
+    db = SessionLocal()
+    try:
+        return db.execute(select(func.now())).scalar()
+    finally:
+        db.close()
+
+
 @router.post("/update-scores", response_model=UpdateScoresResponse)
 async def update_scores(
     request: UpdateScoresRequest,
     background_tasks: BackgroundTasks,
-    db: Session = Depends(get_db),
     current_user = Depends(get_admin_user)
 ):
     """
@@ -438,30 +583,31 @@ async def update_scores(
     - Si `destination_id` se especifica, solo actualiza ese destino
     - Si `force_update=true`, actualiza incluso si ya tienen score reciente
     """
-    import time
     start_time = time.time()
     
     try:
-        service = ScoringService(db)
-        
-        # Filtrar atracciones a actualizar
-        query = db.query(Attraction)
-        
-        if request.destination_id:
-            query = query.filter(Attraction.destination_id == request.destination_id)
-        
+        cutoff = None
         if not request.force_update:
             # Solo las que no tienen score o tienen score antiguo (>24h)
             from datetime import timedelta
             cutoff = datetime.utcnow() - timedelta(hours=24)
-            query = query.filter(
-                (Attraction.nn_score == None) | 
-                (Attraction.nn_score_updated_at < cutoff)
+        
+        # Reloj de la BD al empezar: lo que ya escribió otro worker de esta
+        # misma ejecución (nn_score_updated_at posterior) no se repite
+        run_started = await run_in_threadpool(_database_now)
+        
+        results = await asyncio.gather(*(
+            run_in_threadpool(
+                _update_scores_worker, request.destination_id, cutoff, run_started
             )
+            for _ in range(UPDATE_SCORES_WORKERS)
+        ))
         
-        attractions = query.all()
+        updated = sum(result[0] for result in results)
+        failed = sum(result[1] for result in results)
+        errors = [error for result in results for error in result[2]]
         
-        if not attractions:
+        if updated == 0 and failed == 0:
             return UpdateScoresResponse(
                 updated_count=0,
                 failed_count=0,
@@ -469,33 +615,8 @@ async def update_scores(
                 errors=["No hay atracciones para actualizar"]
             )
         
-        updated = 0
-        failed = 0
-        errors = []
-        
-        # Actualizar en batches
-        batch_size = 100
-        for i in range(0, len(attractions), batch_size):
-            batch = attractions[i:i + batch_size]
-            
-            for attraction in batch:
-                try:
-                    score = service.update_attraction_score(attraction)
-                    if score is not None:
-                        updated += 1
-                    else:
-                        failed += 1
-                        errors.append(f"Atracción {attraction.id}: modelo no disponible")
-                except Exception as e:
-                    failed += 1
-                    errors.append(f"Atracción {attraction.id}: {str(e)}")
-            
-            # Commit cada batch
-            db.commit()
-        
-        # Limpiar cache después de actualizar BD
-        cache = ScoreCache()
-        cache.clear()
+        # Los workers ya invalidaron los scores actualizados
+        statistics_cache.invalidate()
         
         return UpdateScoresResponse(
             updated_count=updated,
@@ -517,7 +638,7 @@ async def get_top_attractions(
     destination_id: int,
     limit: int = Query(default=10, ge=1, le=100),
     category: Optional[str] = Query(default=None, description="Filtrar por categoría"),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Obtener las mejores atracciones de un destino según el score de la NN
@@ -525,23 +646,23 @@ async def get_top_attractions(
     Útil para mostrar recomendaciones destacadas.
     """
     # Verificar destino
-    destination = db.query(Destination).filter(
-        Destination.id == destination_id
-    ).first()
+    destination_exists = (await db.execute(
+        select(Destination.id).where(Destination.id == destination_id)
+    )).first()
     
-    if not destination:
+    if not destination_exists:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=f"Destino {destination_id} no encontrado"
         )
     
-    service = ScoringService(db)
-    
-    top_attractions = service.get_top_scored_attractions(
-        destination_id=destination_id,
-        limit=limit,
-        category=category
-    )
+    top_attractions = (await db.execute(
+        *ScoringService.top_scored_statement(
+            destination_id=destination_id,
+            limit=limit,
+            category=category
+        )
+    )).all()
     
     return [
         {
@@ -569,9 +690,9 @@ async def clear_cache(
     
     Útil después de reentrenar el modelo o actualizar datos.
     """
-    cache = ScoreCache()
-    size_before = len(cache._cache)
-    cache.clear()
+    size_before = score_cache.size
+    score_cache.clear()
+    statistics_cache.invalidate()
     
     return {
         "message": "Cache limpiado",
@@ -579,66 +700,78 @@ async def clear_cache(
     }
 
 
-@router.get("/statistics")
-async def get_statistics(
-    db: Session = Depends(get_db)
-):
-    """
-    Obtener estadísticas del sistema de scoring
-    
-    Incluye distribución de scores, cobertura, etc.
-    """
-    from sqlalchemy import func
-    
-    # Total de atracciones
-    total = db.query(func.count(Attraction.id)).scalar()
-    
-    # Con score
-    with_score = db.query(func.count(Attraction.id)).filter(
-        Attraction.nn_score != None
-    ).scalar()
-    
-    # Estadísticas de scores
-    score_stats = db.query(
-        func.min(Attraction.nn_score).label('min'),
-        func.max(Attraction.nn_score).label('max'),
-        func.avg(Attraction.nn_score).label('avg'),
-        func.stddev(Attraction.nn_score).label('stddev')
-    ).filter(Attraction.nn_score != None).first()
-    
-    # Distribución por rangos
-    distribution = {}
-    for label, low, high in [
+async def _compute_score_statistics(db: AsyncSession) -> Dict[str, Any]:
+    """Cobertura, estadísticas y distribución de nn_score (consulta a BD)"""
+    score_ranges = [
         ("bajo (0-0.3)", 0, 0.3),
         ("medio (0.3-0.6)", 0.3, 0.6),
         ("alto (0.6-0.8)", 0.6, 0.8),
         ("excelente (0.8-1.0)", 0.8, 1.0)
-    ]:
-        count = db.query(func.count(Attraction.id)).filter(
-            Attraction.nn_score >= low,
-            Attraction.nn_score < high if high < 1.0 else Attraction.nn_score <= high
-        ).scalar()
-        distribution[label] = count
+    ]
     
-    # Cache stats
-    cache = ScoreCache()
+    # Una sola consulta: conteos con FILTER y agregados (que ya ignoran
+    # los NULL) en la misma pasada sobre la tabla
+    row = (await db.execute(select(
+        func.count(Attraction.id),
+        func.count(Attraction.nn_score),
+        func.min(Attraction.nn_score),
+        func.max(Attraction.nn_score),
+        func.avg(Attraction.nn_score),
+        func.stddev(Attraction.nn_score),
+        *[
+            func.count().filter(
+                Attraction.nn_score >= low,
+                Attraction.nn_score < high if high < 1.0 else Attraction.nn_score <= high
+            )
+            for _, low, high in score_ranges
+        ]
+    ))).one()
+    
+    total, with_score = row[0], row[1]
+    score_min, score_max, score_avg, score_stddev = row[2:6]
+    
+    # Distribución por rangos
+    distribution = {
+        label: count for (label, _, _), count in zip(score_ranges, row[6:])
+    }
     
     return {
         "total_attractions": total,
         "with_nn_score": with_score,
         "coverage_percent": round((with_score / total * 100) if total > 0 else 0, 2),
         "score_statistics": {
-            "min": float(score_stats.min) if score_stats.min else None,
-            "max": float(score_stats.max) if score_stats.max else None,
-            "avg": float(score_stats.avg) if score_stats.avg else None,
-            "stddev": float(score_stats.stddev) if score_stats.stddev else None
+            "min": float(score_min) if score_min else None,
+            "max": float(score_max) if score_max else None,
+            "avg": float(score_avg) if score_avg else None,
+            "stddev": float(score_stddev) if score_stddev else None
         },
-        "score_distribution": distribution,
+        "score_distribution": distribution
+    }
+
+
+@router.get("/statistics")
+async def get_statistics(
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    Obtener estadísticas del sistema de scoring
+    
+    Incluye distribución de scores, cobertura, etc.
+    Los agregados de BD se reutilizan durante STATISTICS_TTL_SECONDS
+    (se invalidan al actualizar scores o reentrenar).
+    """
+    stats = statistics_cache.get()
+    if stats is None:
+        stats = await _compute_score_statistics(db)
+        statistics_cache.set(stats)
+    
+    return {
+        **stats,
         "cache": {
-            "entries": len(cache._cache),
-            "ttl_minutes": int(cache.ttl / 60)
+            "entries": score_cache.size,
+            "ttl_minutes": int(score_cache.ttl / 60)
         },
-        "model_loaded": AttractionScorer().model is not None
+        "model_loaded": get_scorer().model is not None
     }
 
 
@@ -653,21 +786,20 @@ async def reload_model(
     
     Útil si se actualizó el archivo del modelo externamente.
     """
-    scorer = AttractionScorer()
+    scorer = get_scorer()
     
     old_state = scorer.model is not None
-    scorer._load_model()
-    new_state = scorer.model is not None
+    # Cargar, trazar y (opcionalmente) cuantizar bloquea: fuera del event loop
+    new_state = await run_in_threadpool(scorer.reload_model)
     
     # Limpiar cache al recargar
-    cache = ScoreCache()
-    cache.clear()
+    score_cache.clear()
     
     return {
         "message": "Modelo recargado" if new_state else "No se pudo cargar el modelo",
         "was_loaded": old_state,
         "is_loaded": new_state,
-        "model_path": scorer.model_path
+        "model_path": settings.NN_MODEL_SAVE_PATH
     }
 
 
@@ -678,7 +810,7 @@ async def reload_model(
 @router.get("/diagnose/{attraction_id}")
 async def diagnose_attraction(
     attraction_id: int,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Diagnóstico detallado del scoring de una atracción
@@ -686,9 +818,7 @@ async def diagnose_attraction(
     Muestra todas las features utilizadas por la red neuronal
     y cómo se calculó el score.
     """
-    attraction = db.query(Attraction).filter(
-        Attraction.id == attraction_id
-    ).first()
+    attraction = await db.get(Attraction, attraction_id)
     
     if not attraction:
         raise HTTPException(
@@ -700,7 +830,7 @@ async def diagnose_attraction(
     features = attraction.get_features_for_nn()
     
     # Obtener score actual
-    scorer = AttractionScorer()
+    scorer = get_scorer()
     predicted_score = None
     
     if scorer.model is not None:
@@ -0,0 +1,64 @@
+# backend/services/route_optimizer/_tsp_kernel.py
+"""
+Kernel compilado de 2-opt para el orden de visita
+
+Trabaja sobre arrays (`float64[:, ::1]` y `int64[::1]`) y calcula el
+delta de cada inversión sin construir tours temporales. La matriz puede
+ser asimétrica, por eso el delta incluye los tramos internos invertidos.
+Sólo se usa si numba está instalado; si no, `tsp.two_opt` sigue en Python.
+"""
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:  # numba es opcional
+    NUMBA_AVAILABLE = False
+
+
+# Tolerancia para aceptar una mejora (evita ciclos por redondeo)
+_EPS = 1e-9
+
+# fastmath sin 'nnan'/'ninf': la matriz usa inf para pares sin ruta
+_FASTMATH_FLAGS = {'nsz', 'arcp', 'contract', 'afn', 'reassoc'}
+
+
+def _two_opt(dist, tour, end):
+    n = tour.shape[0]
+    best = tour.copy()
+    improved = True
+    while improved:
+        improved = False
+        for i in range(1, n - 1):
+            a = best[i - 1]
+            for j in range(i + 1, n):
+                b = end if j == n - 1 else best[j + 1]
+                old = dist[a, best[i]] + dist[best[j], b]
+                new = dist[a, best[j]] + dist[best[i], b]
+                for k in range(i, j):
+                    old += dist[best[k], best[k + 1]]
+                    new += dist[best[k + 1], best[k]]
+                if new - old < -_EPS:
+                    # Invertir el sub-tramo i..j y reiniciar la pasada
+                    lo, hi = i, j
+                    while lo < hi:
+                        tmp = best[lo]
+                        best[lo] = best[hi]
+                        best[hi] = tmp
+                        lo += 1
+                        hi -= 1
+                    improved = True
+                    break
+            if improved:
+                break
+
+    total = 0.0
+    for k in range(n - 1):
+        total += dist[best[k], best[k + 1]]
+    if best[n - 1] != end:
+        total += dist[best[n - 1], end]
+    return best, total
+
+
+if NUMBA_AVAILABLE:
+    two_opt_kernel = njit(cache=True, fastmath=_FASTMATH_FLAGS, boundscheck=False)(_two_opt)
+else:
+    two_opt_kernel = _two_opt
@@ -64,21 +64,28 @@ class AStar:
         start_attraction_id: int,
         end_attraction_id: int,
         attraction_scores: Optional[Dict[int, float]] = None,
-        max_iterations: int = 10000
+        max_iterations: int = 10000,
+        graph: Optional[GraphDataManager] = None
     ) -> OptimizedRoute:
         """
         Encontrar ruta óptima usando A* con carga en memoria (GraphLoader)
+        
+        Si se pasa `graph` se reutiliza en lugar de cargarlo desde la DB
+        (útil cuando se calculan muchas rutas del mismo destino).
         """
         logger.info(f"Buscando ruta A*: {start_attraction_id} → {end_attraction_id}")
         
-        # 1. Obtener la atracción de inicio de la DB SOLO para saber el destination_id
-        # y cargar el grafo correcto.
-        start_attr_db = self.db.query(Attraction).filter(Attraction.id == start_attraction_id).first()
-        if not start_attr_db:
-            raise ValueError(f"Atracción de inicio {start_attraction_id} no encontrada")
-            
-        # 2. CARGAR EL GRAFO EN MEMORIA (Optimización N+1)
-        graph = GraphDataManager(self.db, start_attr_db.destination_id)
+        if graph is None:
+            # 1. Obtener la atracción de inicio de la DB SOLO para saber el destination_id
+            # y cargar el grafo correcto.
+            destination_id = self.db.query(Attraction.destination_id).filter(
+                Attraction.id == start_attraction_id
+            ).scalar()
+            if destination_id is None:
+                raise ValueError(f"Atracción de inicio {start_attraction_id} no encontrada")
+                
+            # 2. CARGAR EL GRAFO EN MEMORIA (Optimización N+1)
+            graph = GraphDataManager(self.db, destination_id)
 
         # Obtener nodos de inicio y fin desde la memoria RAM
         start_node_data = graph.get_node(start_attraction_id)
@@ -97,18 +104,27 @@ class AStar:
         came_from: Dict[int, int] = {}
         g_scores: Dict[int, float] = {start_attraction_id: 0.0}
         
-        # Calcular heurística inicial (usando coordenadas del diccionario)
-        h_initial = 0.0
-        if self.heuristic_type == 'euclidean':
-            h_initial = Heuristics.haversine_distance(
-                start_node_data['lat'], start_node_data['lon'],
-                end_node_data['lat'], end_node_data['lon']
-            )
+        # Heurística por atracción (objetivo fijo): un nodo puede relajarse
+        # muchas veces, pero su distancia al destino se calcula una sola
+        h_cache: Dict[int, float] = {}
+        end_lat, end_lon = end_node_data['lat'], end_node_data['lon']
+        
+        def h(attraction_id: int) -> float:
+            value = h_cache.get(attraction_id)
+            if value is None:
+                value = 0.0
+                node_data = graph.get_node(attraction_id)
+                if node_data and self.heuristic_type == 'euclidean':
+                    value = Heuristics.haversine_distance(
+                        node_data['lat'], node_data['lon'], end_lat, end_lon
+                    )
+                h_cache[attraction_id] = value
+            return value
 
         initial_node = AStarNode(
             attraction_id=start_attraction_id,
             g_cost=0.0,
-            h_cost=h_initial,
+            h_cost=h(start_attraction_id),
             parent_id=None
         )
         heappush(open_set, initial_node)
@@ -145,18 +161,16 @@ class AStar:
             
             closed_set.add(current_id)
             
-            # 3. OBTENER VECINOS DE MEMORIA (No SQL)
-            neighbors = graph.get_neighbors(current_id)
-            
-            for neighbor in neighbors:
-                neighbor_id = neighbor['to_attraction_id']
-                
+            # 3. OBTENER VECINOS DE MEMORIA (No SQL, tuplas sin dicts)
+            for neighbor_id, distance, travel_time, cost in graph.get_edges(current_id):
                 # Saltar si ya fue explorado
                 if neighbor_id in closed_set:
                     continue
                 
                 # Calcular g_cost del vecino
-                edge_cost = self._calculate_edge_cost(neighbor, attraction_scores)
+                edge_cost = self._calculate_edge_cost(
+                    neighbor_id, distance, travel_time, cost, attraction_scores
+                )
                 tentative_g = current_node.g_cost + edge_cost
                 
                 # Si encontramos un mejor camino
@@ -164,21 +178,11 @@ class AStar:
                     g_scores[neighbor_id] = tentative_g
                     came_from[neighbor_id] = current_id
                     
-                    # 4. CALCULAR HEURÍSTICA (Usando datos en memoria)
-                    h_cost = 0.0
-                    neighbor_data = graph.get_node(neighbor_id)
-                    
-                    if neighbor_data and self.heuristic_type == 'euclidean':
-                        # Llamada correcta a la estática con 4 argumentos
-                        h_cost = Heuristics.haversine_distance(
-                            neighbor_data['lat'], neighbor_data['lon'],
-                            end_node_data['lat'], end_node_data['lon']
-                        )
-                        
+                    # 4. HEURÍSTICA (cacheada por atracción)
                     neighbor_node = AStarNode(
                         attraction_id=neighbor_id,
                         g_cost=tentative_g,
-                        h_cost=h_cost,
+                        h_cost=h(neighbor_id),
                         parent_id=current_id
                     )
                         
@@ -194,18 +198,21 @@ class AStar:
     
     def _calculate_edge_cost(
         self,
-        connection: Dict,
+        to_attraction_id: int,
+        distance_meters: float,
+        travel_time_minutes: int,
+        cost: float,
         attraction_scores: Optional[Dict[int, float]]
     ) -> float:
         """Calcular costo de una arista"""
         # Score de idoneidad
         score = 0.0
-        if attraction_scores and connection['to_attraction_id'] in attraction_scores:
-            score = attraction_scores[connection['to_attraction_id']]
+        if attraction_scores:
+            score = attraction_scores.get(to_attraction_id, 0.0)
         
         return self.cost_calculator.calculate_edge_cost(
-            distance_meters=connection['distance_meters'],
-            travel_time_minutes=connection['travel_time_minutes'],
-            cost=connection['cost'],
+            distance_meters=distance_meters,
+            travel_time_minutes=travel_time_minutes,
+            cost=cost,
             suitability_score=score
         )
\ No newline at end of file
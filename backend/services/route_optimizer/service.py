@@ -3,13 +3,17 @@
 Servicio para optimización de rutas usando A*
 Integrado con Red Neuronal para scoring de atracciones
 """
-from typing import List, Dict, Optional
+import math
+from typing import List, Dict, Optional, Tuple
 from sqlalchemy.orm import Session
 from fastapi import HTTPException, status
 
 from .a_star import AStar
 from .path_generator import OptimizedRoute
+from .tsp import solve_tsp
 from shared.database. models import Attraction
+from shared.config.constants import DEFAULT_VISIT_DURATION
+from shared.graph_loader import GraphDataManager
 from shared.utils.logger import setup_logger
 # Importar el servicio de scoring de la red neuronal
 from services.ml_service.models.inference import get_attraction_scores
@@ -184,29 +188,7 @@ class RouterOptimizerService:
             
             current_location = start_attraction_id
             remaining_stops = waypoints. copy()
-            
-            all_attractions = []
-            all_segments = []
-            total_distance = 0.0
-            total_time = 0
-            total_cost = 0.0
-            total_nodes = 0
-            
-            # Contadores para análisis
-            transport_stats = {
-                "walking": 0,
-                "public_transit": 0,
-                "taxi": 0
-            }
-            
-            all_attractions.append({
-                'id': start_attr.id,
-                'name': start_attr.name,
-                'category': start_attr. category,
-                'order': 0
-            })
-            
-            order = 1
+            legs: List[OptimizedRoute] = []
             
             while remaining_stops:
                 best_next = None
@@ -255,36 +237,7 @@ class RouterOptimizerService:
                 
                 # ═══════════════════════════════════════════════════════════
                 
-                for attr in best_route.attractions[1:]:
-                    attr['order'] = order
-                    all_attractions.append(attr)
-                    order += 1
-                
-                # Procesar segmentos y contar tipos de transporte
-                for seg in best_route.segments:
-                    segment_dict = {
-                        'from_attraction_id': seg.from_attraction_id,
-                        'to_attraction_id': seg.to_attraction_id,
-                        'distance_meters': seg.distance_meters,
-                        'travel_time_minutes': seg.travel_time_minutes,
-                        'transport_mode': seg.transport_mode,
-                        'cost': seg.cost
-                    }
-                    all_segments.append(segment_dict)
-                    
-                    # Estadísticas de transporte
-                    if seg.cost == 0:
-                        transport_stats["walking"] += 1
-                    elif seg.cost <= RouterOptimizerService.COST_THRESHOLDS["medium"]:
-                        transport_stats["public_transit"] += 1
-                    else:
-                        transport_stats["taxi"] += 1
-                
-                total_distance += best_route.total_distance
-                total_time += best_route. total_time
-                total_cost += best_route.total_cost
-                total_nodes += best_route.nodes_explored
-                
+                legs.append(best_route)
                 current_location = best_next
                 remaining_stops. remove(best_next)
             
@@ -297,101 +250,26 @@ class RouterOptimizerService:
                 )
                 
                 if final_route. path_found:
-
-                    
                     if optimization_mode == "cost":
                         logger.info(
                             f"💰 Ruta de regreso: costo=${final_route. total_cost:.2f}, "
                             f"distancia={final_route. total_distance:.0f}m"
                         )
                     
-                    # ═══════════════════════════════════════════════════════════
-                    
-                    for attr in final_route.attractions[1:]:
-                        attr['order'] = order
-                        all_attractions.append(attr)
-                        order += 1
-                    
-                    for seg in final_route.segments:
-                        segment_dict = {
-                            'from_attraction_id': seg.from_attraction_id,
-                            'to_attraction_id': seg.to_attraction_id,
-                            'distance_meters': seg.distance_meters,
-                            'travel_time_minutes': seg.travel_time_minutes,
-                            'transport_mode': seg.transport_mode,
-                            'cost': seg.cost
-                        }
-                        all_segments.append(segment_dict)
-                        
-                        if seg.cost == 0:
-                            transport_stats["walking"] += 1
-                        elif seg. cost <= RouterOptimizerService. COST_THRESHOLDS["medium"]:
-                            transport_stats["public_transit"] += 1
-                        else:
-                            transport_stats["taxi"] += 1
-                    
-                    total_distance += final_route. total_distance
-                    total_time += final_route.total_time
-                    total_cost += final_route.total_cost
-                    total_nodes += final_route.nodes_explored
+                    legs.append(final_route)
             
-            # ═══════════════════════════════════════════════════════════
-            # CALCULAR SCORE DE OPTIMIZACIÓN SEGÚN MODO
-            # ═══════════════════════════════════════════════════════════
-            
-            optimization_score = RouterOptimizerService._calculate_optimization_score(
+            return RouterOptimizerService._assemble_multi_stop_result(
+                start_info={
+                    'id': start_attr.id,
+                    'name': start_attr.name,
+                    'category': start_attr.category
+                },
+                legs=legs,
                 optimization_mode=optimization_mode,
-                total_distance=total_distance,
-                total_time=total_time,
-                total_cost=total_cost,
-                transport_stats=transport_stats
+                waypoints_requested=len(waypoints),
+                waypoints_visited=len(waypoints) - len(remaining_stops)
             )
             
-            # ═══════════════════════════════════════════════════════════
-            # LOG RESUMEN FINAL
-            # ═══════════════════════════════════════════════════════════
-            
-            logger.info(
-                f"✅ Ruta completada ({optimization_mode}): "
-                f"{len(all_attractions)} atracciones, "
-                f"{total_distance:.0f}m, {total_time}min, ${total_cost:.2f}"
-            )
-            
-            if optimization_mode == "cost":
-                logger.info(
-                    f"📊 Transporte: {transport_stats['walking']} caminando, "
-                    f"{transport_stats['public_transit']} transporte público, "
-                    f"{transport_stats['taxi']} taxi"
-                )
-            
-            # ═══════════════════════════════════════════════════════════
-            
-            return {
-                "path_found": len(all_attractions) > 0,
-                "start_attraction": {
-                    "id": start_attr. id,
-                    "name": start_attr.name
-                },
-                "attractions": all_attractions,
-                "segments": all_segments,
-                "summary": {
-                    "total_attractions": len(all_attractions),
-                    "total_distance_meters": round(total_distance, 2),
-                    "total_distance_km": round(total_distance / 1000, 2),
-                    "total_time_minutes": total_time,
-                    "total_time_hours": round(total_time / 60, 2),
-                    "total_cost": round(total_cost, 2),
-                    "optimization_score": round(optimization_score, 2),
-                    "nodes_explored": total_nodes,
-                    "transport_breakdown": transport_stats  # ← NUEVO
-                },
-                "metadata": {
-                    "optimization_mode": optimization_mode,
-                    "waypoints_requested": len(waypoints),
-                    "waypoints_visited": len(waypoints) - len(remaining_stops)
-                }
-            }
-            
         except HTTPException:
             raise
         except Exception as e:
@@ -401,6 +279,262 @@ class RouterOptimizerService:
                 detail=f"Error al optimizar ruta multi-stop: {str(e)}"
             )
     
+    @staticmethod
+    def compute_route_matrix(
+        db: Session,
+        attraction_ids: List[int],
+        optimization_mode: str = "balanced",
+        attraction_scores: Optional[Dict[int, float]] = None,
+        graph: Optional[GraphDataManager] = None
+    ) -> Tuple[List[List[float]], Dict[Tuple[int, int], OptimizedRoute]]:
+        """
+        Calcular rutas A* entre todos los pares ordenados de atracciones
+        
+        Args:
+            graph: Grafo ya cargado en memoria (se reutiliza en todas las búsquedas)
+        
+        Returns:
+            (matriz de costos ponderados con inf si no hay ruta, rutas por par)
+        """
+        weights = RouterOptimizerService.MODE_WEIGHTS.get(
+            optimization_mode,
+            RouterOptimizerService.MODE_WEIGHTS["balanced"]
+        )
+        astar = AStar(db=db, optimization_mode=optimization_mode)
+        
+        n = len(attraction_ids)
+        matrix = [[0.0] * n for _ in range(n)]
+        routes: Dict[Tuple[int, int], OptimizedRoute] = {}
+        
+        for i, from_id in enumerate(attraction_ids):
+            for j, to_id in enumerate(attraction_ids):
+                if i == j:
+                    continue
+                route = astar.find_path(
+                    start_attraction_id=from_id,
+                    end_attraction_id=to_id,
+                    attraction_scores=attraction_scores,
+                    graph=graph
+                )
+                if route.path_found:
+                    routes[(from_id, to_id)] = route
+                    matrix[i][j] = RouterOptimizerService._calculate_weighted_route_cost(
+                        route=route,
+                        weights=weights,
+                        optimization_mode=optimization_mode
+                    )
+                else:
+                    matrix[i][j] = math.inf
+        
+        return matrix, routes
+    
+    @staticmethod
+    def optimize_multi_stop_matrix(
+        db: Session,
+        start_attraction_id: int,
+        waypoints: List[int],
+        end_attraction_id: Optional[int] = None,
+        optimization_mode: str = "balanced",
+        attraction_scores: Optional[Dict[int, float]] = None,
+        graph: Optional[GraphDataManager] = None,
+        visit_durations: Optional[Dict[int, int]] = None
+    ) -> Dict:
+        """
+        Optimizar ruta multi-parada resolviendo el TSP sobre una matriz de costos
+        
+        A diferencia de `optimize_multi_stop` (vecino más cercano con A* en cada
+        paso), calcula una vez las rutas entre todos los pares y elige el orden
+        con Held-Karp / 2-opt. Devuelve la misma estructura de respuesta.
+        
+        Si se pasan `visit_durations`, la respuesta incluye además `day_data`
+        con el formato que guarda `ItineraryDay.day_data`.
+        """
+        if end_attraction_id is None:
+            end_attraction_id = start_attraction_id
+        
+        if graph is None:
+            start_attr = db.query(Attraction).filter(
+                Attraction.id == start_attraction_id
+            ).first()
+            if not start_attr:
+                raise HTTPException(
+                    status_code=status.HTTP_404_NOT_FOUND,
+                    detail=f"Atracción de inicio {start_attraction_id} no encontrada"
+                )
+            graph = GraphDataManager(db, start_attr.destination_id)
+        
+        start_node = graph.get_node(start_attraction_id) or {'id': start_attraction_id}
+        
+        # Índice 0 = inicio; el final se agrega sólo si es distinto
+        stops = [w for w in dict.fromkeys(waypoints) if w not in (start_attraction_id, end_attraction_id)]
+        ids = [start_attraction_id] + stops
+        end_index = 0
+        if end_attraction_id != start_attraction_id:
+            ids.append(end_attraction_id)
+            end_index = len(ids) - 1
+        
+        matrix, routes = RouterOptimizerService.compute_route_matrix(
+            db=db,
+            attraction_ids=ids,
+            optimization_mode=optimization_mode,
+            attraction_scores=attraction_scores,
+            graph=graph
+        )
+        
+        tour = solve_tsp(matrix, end=end_index)
+        
+        legs: List[OptimizedRoute] = []
+        for a, b in zip(tour, tour[1:]):
+            legs.append(routes[(ids[a], ids[b])])
+        
+        # Tramo final hacia el punto de término
+        last_id = ids[tour[-1]]
+        if last_id != end_attraction_id and (last_id, end_attraction_id) in routes:
+            legs.append(routes[(last_id, end_attraction_id)])
+        
+        visited = len(tour) - 1
+        
+        result = RouterOptimizerService._assemble_multi_stop_result(
+            start_info={
+                'id': start_attraction_id,
+                'name': start_node.get('name'),
+                'category': start_node.get('category')
+            },
+            legs=legs,
+            optimization_mode=optimization_mode,
+            waypoints_requested=len(waypoints),
+            waypoints_visited=visited
+        )
+        
+        if visit_durations is not None:
+            scores = attraction_scores or {}
+            result['day_data'] = {
+                "attractions": [
+                    {
+                        "attraction_id": attr['id'],
+                        "order": i + 1,
+                        "visit_duration_minutes": visit_durations.get(attr['id'], DEFAULT_VISIT_DURATION),
+                        "score": scores.get(attr['id'])
+                    }
+                    for i, attr in enumerate(result['attractions'])
+                ],
+                "segments": result['segments']
+            }
+        
+        return result
+    
+    @staticmethod
+    def _assemble_multi_stop_result(
+        start_info: Dict,
+        legs: List[OptimizedRoute],
+        optimization_mode: str,
+        waypoints_requested: int,
+        waypoints_visited: int
+    ) -> Dict:
+        """
+        Unir los tramos A* de una ruta multi-parada en la respuesta final
+        """
+        all_attractions = [{**start_info, 'order': 0}]
+        all_segments = []
+        total_distance = 0.0
+        total_time = 0
+        total_cost = 0.0
+        total_nodes = 0
+        
+        # Contadores para análisis
+        transport_stats = {
+            "walking": 0,
+            "public_transit": 0,
+            "taxi": 0
+        }
+        
+        order = 1
+        for leg in legs:
+            for attr in leg.attractions[1:]:
+                attr['order'] = order
+                all_attractions.append(attr)
+                order += 1
+            
+            # Procesar segmentos y contar tipos de transporte
+            for seg in leg.segments:
+                all_segments.append({
+                    'from_attraction_id': seg.from_attraction_id,
+                    'to_attraction_id': seg.to_attraction_id,
+                    'distance_meters': seg.distance_meters,
+                    'travel_time_minutes': seg.travel_time_minutes,
+                    'transport_mode': seg.transport_mode,
+                    'cost': seg.cost
+                })
+                
+                if seg.cost == 0:
+                    transport_stats["walking"] += 1
+                elif seg.cost <= RouterOptimizerService.COST_THRESHOLDS["medium"]:
+                    transport_stats["public_transit"] += 1
+                else:
+                    transport_stats["taxi"] += 1
+            
+            total_distance += leg.total_distance
+            total_time += leg.total_time
+            total_cost += leg.total_cost
+            total_nodes += leg.nodes_explored
+        
+        # ═══════════════════════════════════════════════════════════
+        # CALCULAR SCORE DE OPTIMIZACIÓN SEGÚN MODO
+        # ═══════════════════════════════════════════════════════════
+        
+        optimization_score = RouterOptimizerService._calculate_optimization_score(
+            optimization_mode=optimization_mode,
+            total_distance=total_distance,
+            total_time=total_time,
+            total_cost=total_cost,
+            transport_stats=transport_stats
+        )
+        
+        # ═══════════════════════════════════════════════════════════
+        # LOG RESUMEN FINAL
+        # ═══════════════════════════════════════════════════════════
+        
+        logger.info(
+            f"✅ Ruta completada ({optimization_mode}): "
+            f"{len(all_attractions)} atracciones, "
+            f"{total_distance:.0f}m, {total_time}min, ${total_cost:.2f}"
+        )
+        
+        if optimization_mode == "cost":
+            logger.info(
+                f"📊 Transporte: {transport_stats['walking']} caminando, "
+                f"{transport_stats['public_transit']} transporte público, "
+                f"{transport_stats['taxi']} taxi"
+            )
+        
+        # ═══════════════════════════════════════════════════════════
+        
+        return {
+            "path_found": len(all_attractions) > 0,
+            "start_attraction": {
+                "id": start_info['id'],
+                "name": start_info['name']
+            },
+            "attractions": all_attractions,
+            "segments": all_segments,
+            "summary": {
+                "total_attractions": len(all_attractions),
+                "total_distance_meters": round(total_distance, 2),
+                "total_distance_km": round(total_distance / 1000, 2),
+                "total_time_minutes": total_time,
+                "total_time_hours": round(total_time / 60, 2),
+                "total_cost": round(total_cost, 2),
+                "optimization_score": round(optimization_score, 2),
+                "nodes_explored": total_nodes,
+                "transport_breakdown": transport_stats
+            },
+            "metadata": {
+                "optimization_mode": optimization_mode,
+                "waypoints_requested": waypoints_requested,
+                "waypoints_visited": waypoints_visited
+            }
+        }
+    
     @staticmethod
     def _calculate_weighted_route_cost(
         route: OptimizedRoute,
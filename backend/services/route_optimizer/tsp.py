@@ -0,0 +1,157 @@
+# backend/services/route_optimizer/tsp.py
+"""
+Resolución del orden de visita (TSP) sobre una matriz de costos precalculada
+
+La matriz puede ser asimétrica (conexiones dirigidas) y usar `math.inf`
+para pares sin ruta. El índice 0 es siempre el punto de inicio.
+"""
+import math
+from typing import List, Tuple
+
+import numpy as np
+
+from ._tsp_kernel import two_opt_kernel, NUMBA_AVAILABLE
+
+# Held-Karp es exacto pero O(2^n · n²): sólo para pocas paradas
+HELD_KARP_MAX_STOPS = 10
+
+
+def tour_cost(cost: List[List[float]], tour: List[int], end: int) -> float:
+    """Costo de recorrer `tour` (que empieza en 0) y terminar en `end`"""
+    total = 0.0
+    for a, b in zip(tour, tour[1:]):
+        total += cost[a][b]
+    if tour[-1] != end:
+        total += cost[tour[-1]][end]
+    return total
+
+
+def held_karp(cost: List[List[float]], end: int = 0) -> Tuple[List[int], float]:
+    """
+    Orden óptimo por programación dinámica (Held-Karp)
+
+    Args:
+        cost: Matriz n×n de costos
+        end: Índice donde termina la ruta (0 = volver al inicio)
+
+    Returns:
+        (tour, costo): tour empieza en 0 y no repite `end` salvo que sea parada
+    """
+    stops = [i for i in range(1, len(cost)) if i != end]
+    k = len(stops)
+    if k == 0:
+        return [0], tour_cost(cost, [0], end)
+
+    # dp[mask][j]: costo mínimo desde 0 visitando `mask` y terminando en stops[j]
+    full = 1 << k
+    dp = [[math.inf] * k for _ in range(full)]
+    parent = [[-1] * k for _ in range(full)]
+    for j, node in enumerate(stops):
+        dp[1 << j][j] = cost[0][node]
+
+    for mask in range(1, full):
+        row = dp[mask]
+        for j in range(k):
+            current = row[j]
+            if current == math.inf or not (mask >> j) & 1:
+                continue
+            from_node = stops[j]
+            for nxt in range(k):
+                if (mask >> nxt) & 1:
+                    continue
+                new_mask = mask | (1 << nxt)
+                candidate = current + cost[from_node][stops[nxt]]
+                if candidate < dp[new_mask][nxt]:
+                    dp[new_mask][nxt] = candidate
+                    parent[new_mask][nxt] = j
+
+    last_row = dp[full - 1]
+    best_cost = math.inf
+    best_j = -1
+    for j in range(k):
+        candidate = last_row[j] + cost[stops[j]][end]
+        if candidate < best_cost:
+            best_cost = candidate
+            best_j = j
+
+    if best_j < 0:
+        return [0], math.inf
+
+    order = []
+    mask, j = full - 1, best_j
+    while j >= 0:
+        order.append(stops[j])
+        mask, j = mask ^ (1 << j), parent[mask][j]
+    order.reverse()
+
+    return [0] + order, best_cost
+
+
+def nearest_neighbor(cost: List[List[float]], end: int = 0) -> List[int]:
+    """
+    Tour greedy: siempre la parada alcanzable más barata
+    Se detiene si ninguna parada restante es alcanzable.
+    """
+    remaining = {i for i in range(1, len(cost)) if i != end}
+    tour = [0]
+    current = 0
+    while remaining:
+        nxt = min(remaining, key=lambda i: cost[current][i])
+        if cost[current][nxt] == math.inf:
+            break
+        tour.append(nxt)
+        remaining.discard(nxt)
+        current = nxt
+    return tour
+
+
+def two_opt(cost: List[List[float]], tour: List[int], end: int = 0) -> Tuple[List[int], float]:
+    """
+    Mejorar un tour invirtiendo sub-tramos mientras baje el costo
+    Con numba se usa el kernel compilado; en Python el costo se recalcula
+    completo porque la matriz puede ser asimétrica.
+    """
+    if NUMBA_AVAILABLE:
+        best_arr, best_cost = two_opt_kernel(
+            np.ascontiguousarray(cost, dtype=np.float64),
+            np.asarray(tour, dtype=np.int64),
+            end
+        )
+        return best_arr.tolist(), best_cost
+
+    best = list(tour)
+    best_cost = tour_cost(cost, best, end)
+    improved = True
+    while improved:
+        improved = False
+        for i in range(1, len(best) - 1):
+            for j in range(i + 1, len(best)):
+                candidate = best[:i] + best[i:j + 1][::-1] + best[j + 1:]
+                candidate_cost = tour_cost(cost, candidate, end)
+                if candidate_cost < best_cost:
+                    best, best_cost = candidate, candidate_cost
+                    improved = True
+    return best, best_cost
+
+
+def solve_tsp(cost: List[List[float]], end: int = 0) -> List[int]:
+    """
+    Orden de visita para la matriz dada
+
+    Held-Karp exacto si hay pocas paradas; si no (o si no existe un tour
+    completo), vecino más cercano refinado con 2-opt.
+
+    Returns:
+        Índices en orden de visita empezando en 0 (sin incluir `end`
+        salvo que sea una parada). Puede omitir paradas inalcanzables.
+    """
+    num_stops = len(cost) - (1 if end == 0 else 2)
+    if num_stops <= HELD_KARP_MAX_STOPS:
+        tour, total = held_karp(cost, end)
+        if total < math.inf:
+            return tour
+
+    tour = nearest_neighbor(cost, end)
+    if len(tour) > 2:
+        tour, _ = two_opt(cost, tour, end)
+    return tour
@@ -154,9 +154,14 @@ class SearchService:
             candidates_formatted = []
             for candidate in result.candidates:
                 attraction = candidate['attraction']
+                attraction_dict = AttractionRead.model_validate(attraction).model_dump()
+                # Coordenadas ya decodificadas por el grafo en memoria
+                # (AttractionRead no las expone como campos sueltos)
+                attraction_dict['lat'] = attraction.get('lat')
+                attraction_dict['lon'] = attraction.get('lon')
                 
                 candidates_formatted.append({
-                    'attraction': AttractionRead.model_validate(attraction).model_dump(),
+                    'attraction': attraction_dict,
                     'depth': candidate['depth'],
                     'distance_from_start_meters': candidate['distance_from_start'],
                     'time_from_start_minutes': candidate['time_from_start'],
@@ -62,6 +62,12 @@ class Settings(BaseSettings):
     NN_BATCH_SIZE: int = 32
     NN_HIDDEN_SIZE: int = 64
     NN_MODEL_SAVE_PATH: str = "./ml_models/attraction_scorer.pth"
+    # Cuantización dinámica int8 de las capas Linear (sólo inferencia en CPU)
+    NN_QUANTIZE: bool = False
+    # Scoring por lotes con ONNX Runtime (requiere onnxruntime)
+    NN_USE_ONNX: bool = False
+    # Hilos intra-op de PyTorch para inferencia (0 = valor por defecto de PyTorch)
+    NN_NUM_THREADS: int = 0
 
     LOG_LEVEL: str = "INFO"
     
@@ -1,11 +1,14 @@
 """
 Database module exports
 """
-from .base import engine, SessionLocal, Base, get_db
+from .base import engine, SessionLocal, Base, get_db, async_engine, AsyncSessionLocal, get_async_db
 
 __all__ = [
     "engine",
     "SessionLocal", 
     "Base",
-    "get_db"
+    "get_db",
+    "async_engine",
+    "AsyncSessionLocal",
+    "get_async_db"
 ]
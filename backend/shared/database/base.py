@@ -1,16 +1,37 @@
+from decimal import Decimal
+import orjson
 from sqlalchemy import create_engine
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 from shared.config.settings import get_settings
 
 settings = get_settings()
 
+
+def _orjson_default(obj):
+    if isinstance(obj, Decimal):
+        return float(obj)
+    raise TypeError
+
+
+def _json_serializer(obj) -> str:
+    """Serializar columnas JSON/JSONB con orjson (claves no-str como json.dumps)"""
+    return orjson.dumps(
+        obj,
+        default=_orjson_default,
+        option=orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+    ).decode()
+
+
 # Engine síncrono para Alembic
 engine = create_engine(
     settings.DATABASE_URL,
     pool_pre_ping=True,
     pool_size=5,
-    max_overflow=10
+    max_overflow=10,
+    json_serializer=_json_serializer
 )
 
 SessionLocal = sessionmaker(
@@ -19,6 +40,32 @@ SessionLocal = sessionmaker(
     bind=engine
 )
 
+
+def _async_database_url(url: str) -> str:
+    """Misma URL con el driver asyncpg (postgresql[+psycopg2]:// -> postgresql+asyncpg://)"""
+    parsed = make_url(url)
+    if parsed.get_backend_name() == "postgresql":
+        parsed = parsed.set(drivername="postgresql+asyncpg")
+    return parsed.render_as_string(hide_password=False)
+
+
+# Engine asíncrono (asyncpg) para endpoints de sólo lectura: las consultas
+# no bloquean el event loop mientras esperan a la BD
+async_engine = create_async_engine(
+    _async_database_url(settings.DATABASE_URL),
+    pool_pre_ping=True,
+    pool_size=5,
+    max_overflow=10,
+    json_serializer=_json_serializer
+)
+
+AsyncSessionLocal = async_sessionmaker(
+    async_engine,
+    class_=AsyncSession,
+    autoflush=False,
+    expire_on_commit=False
+)
+
 Base = declarative_base()
 
 # Dependency para FastAPI
@@ -28,4 +75,10 @@ def get_db():
     try:
         yield db
     finally:
-        db.close()
\ No newline at end of file
+        db.close()
+
+
+async def get_async_db():
+    """Generador de sesión asíncrona de base de datos"""
+    async with AsyncSessionLocal() as db:
+        yield db
\ No newline at end of file
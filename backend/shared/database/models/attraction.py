@@ -4,13 +4,20 @@ Modelo para atracciones turísticas
 """
 from sqlalchemy import (
     Column, Integer, String, Text, DateTime, 
-    Boolean, Numeric, ForeignKey, func, Index
+    Boolean, Numeric, ForeignKey, func, Index, text
 )
 from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.orm import relationship
 from geoalchemy2 import Geography # type: ignore
 from shared.database.base import Base
 
+# Codificación numérica usada por las características de la red neuronal
+NN_PRICE_LEVELS = {"gratis": 0.0, "bajo": 0.25, "medio": 0.5, "alto": 0.75, "lujo": 1.0}
+NN_CATEGORIES = (
+    'cultural', 'historico', 'gastronomia', 'naturaleza',
+    'aventura', 'deportivo', 'entretenimiento', 'compras', 'religioso'
+)
+
 
 class Attraction(Base):
     """
@@ -143,6 +150,19 @@ class Attraction(Base):
         Index('idx_attraction_dest_score', 'destination_id', 'nn_score'),
         # Nuevo: índice para búsquedas por categoría + score
         Index('idx_attraction_cat_score', 'category', 'nn_score'),
+        # Cubre los lookups id -> nn_score (index-only scan)
+        Index('idx_attraction_id_nn_score', 'id', postgresql_include=['nn_score']),
+        # Top por destino (y categoría): parciales, sólo filas con score
+        Index(
+            'idx_attraction_dest_top_score', 'destination_id', 'nn_score',
+            postgresql_ops={'nn_score': 'DESC'},
+            postgresql_where=text('nn_score IS NOT NULL')
+        ),
+        Index(
+            'idx_attraction_dest_cat_top_score', 'destination_id', 'category', 'nn_score',
+            postgresql_ops={'nn_score': 'DESC'},
+            postgresql_where=text('nn_score IS NOT NULL')
+        ),
     )
 
     def __repr__(self):
@@ -204,15 +224,10 @@ class Attraction(Base):
     
     def _price_to_numeric(self) -> float:
         """Convertir rango de precio a numérico"""
-        mapping = {"gratis": 0.0, "bajo": 0.25, "medio": 0.5, "alto": 0.75, "lujo": 1.0}
-        return mapping.get(self.price_range, 0.5)
+        return NN_PRICE_LEVELS.get(self.price_range, 0.5)
     
     def _category_to_numeric(self) -> float:
         """Convertir categoría a numérico (para embedding simple)"""
-        categories = [
-            'cultural', 'historico', 'gastronomia', 'naturaleza',
-            'aventura', 'deportivo', 'entretenimiento', 'compras', 'religioso'
-        ]
-        if self.category in categories:
-            return categories.index(self.category) / len(categories)
+        if self.category in NN_CATEGORIES:
+            return NN_CATEGORIES.index(self.category) / len(NN_CATEGORIES)
         return 0.5
\ No newline at end of file
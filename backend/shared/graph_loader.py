@@ -1,8 +1,8 @@
 # backend/services/shared/graph_loader.py
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Tuple
 from sqlalchemy.orm import Session
-from geoalchemy2.shape import to_shape # type: ignore
 from shared.database.models import Attraction, AttractionConnection
+from shared.utils.geo import point_xy
 
 class GraphDataManager:
     def __init__(self, db: Session, destination_id: int):
@@ -10,6 +10,9 @@ class GraphDataManager:
         self.destination_id = destination_id
         self.nodes: Dict[int, Dict] = {} 
         self.adjacency_list: Dict[int, List[Dict]] = {}
+        # Mismas aristas como tuplas (to_id, distance_meters, travel_time_minutes, cost)
+        # para el bucle interno de A*
+        self.edges: Dict[int, List[Tuple[int, float, int, float]]] = {}
         
         # Debug
         print(f"🔧 GraphManager: Iniciando carga para Destination ID: {destination_id}")
@@ -28,8 +31,7 @@ class GraphDataManager:
             location_str = None
             if attr.location is not None:
                 try:
-                    point = to_shape(attr.location)
-                    lat, lon = point.y, point.x
+                    lon, lat = point_xy(attr.location)
                     location_str = f"POINT({lon} {lat})"
                 except Exception:
                     pass
@@ -59,6 +61,7 @@ class GraphDataManager:
                 'address': attr.address
             }
             self.adjacency_list[attr.id] = []
+            self.edges[attr.id] = []
 
         # 2. Cargar Conexiones
         attr_ids = list(self.nodes.keys())
@@ -77,14 +80,21 @@ class GraphDataManager:
         for conn in connections:
             # Verificar integridad: origen y destino deben estar en el mapa
             if conn.to_attraction_id in self.nodes:
-                self.adjacency_list[conn.from_attraction_id].append({
+                edge = {
                     'to_attraction_id': conn.to_attraction_id,
                     'distance_meters': float(conn.distance_meters),
                     'travel_time_minutes': conn.travel_time_minutes,
                     'transport_mode': conn.transport_mode,
                     'cost': float(conn.cost) if conn.cost else 0.0,
                     'traffic_factor': float(conn.traffic_factor) if conn.traffic_factor else 1.0
-                })
+                }
+                self.adjacency_list[conn.from_attraction_id].append(edge)
+                self.edges[conn.from_attraction_id].append((
+                    edge['to_attraction_id'],
+                    edge['distance_meters'],
+                    edge['travel_time_minutes'],
+                    edge['cost']
+                ))
                 valid_connections += 1
         
         print(f"🔧 GraphManager: {valid_connections} conexiones válidas cargadas en RAM.")
@@ -96,5 +106,9 @@ class GraphDataManager:
             print(f"🔧 GraphManager: Solicitados vecinos para ID 1. Encontrados: {len(neighbors)}")
         return neighbors
 
+    def get_edges(self, attraction_id: int) -> List[Tuple[int, float, int, float]]:
+        """Aristas salientes como tuplas (to_id, distance_meters, travel_time_minutes, cost)"""
+        return self.edges.get(attraction_id, [])
+
     def get_node(self, attraction_id: int) -> Optional[Dict]:
         return self.nodes.get(attraction_id)
\ No newline at end of file
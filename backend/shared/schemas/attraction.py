@@ -7,7 +7,7 @@ from typing import TYPE_CHECKING, Optional, List, Dict, Any
 from datetime import datetime
 from .base import Location, ResponseBase, TimestampMixin
 from geoalchemy2.elements import WKBElement # type: ignore
-from geoalchemy2.shape import to_shape # type: ignore
+from shared.utils.geo import point_xy
 
 if TYPE_CHECKING:
     from .destination import DestinationRead
@@ -153,10 +153,10 @@ class AttractionRead(AttractionBase, ResponseBase, TimestampMixin):
         try:
             # 1. Si es un objeto de Base de Datos (WKBElement)
             if hasattr(value, 'desc') or isinstance(value, WKBElement):
-                # Convertimos el binario a objeto Python (Shapely)
-                point = to_shape(value)
+                # Leemos las coordenadas directamente del binario
+                x, y = point_xy(value)
                 # Retornamos formato texto: "POINT(-99.13 19.43)"
-                return f"POINT({point.x} {point.y})"
+                return f"POINT({x} {y})"
             
             # 2. Si ya es un string hexadecimal (el caso que te está pasando)
             if isinstance(value, str) and value.startswith('01010000'):
@@ -0,0 +1,51 @@
+# backend/shared/utils/geo.py
+"""
+Utilidades geoespaciales ligeras
+"""
+import struct
+from typing import Any, Optional, Tuple
+
+# Bit de EWKB (PostGIS) que indica que el SRID viene tras el tipo
+_EWKB_SRID_FLAG = 0x20000000
+_WKB_POINT = 1
+
+
+def point_xy(value: Any) -> Optional[Tuple[float, float]]:
+    """
+    Extraer (x, y) = (lon, lat) de un POINT en WKB/EWKB sin construir
+    un objeto Shapely
+    
+    Acepta WKBElement, bytes/memoryview o string hexadecimal. Para
+    geometrías que no son POINT, y para WKTElement o strings WKT/EWKT, se
+    recurre a Shapely y se usa su centroide.
+    
+    Returns:
+        (x, y) o None si no hay valor
+    """
+    if value is None:
+        return None
+    
+    data = getattr(value, 'data', value)
+    if isinstance(data, str):
+        try:
+            data = bytes.fromhex(data)
+        except ValueError:
+            # WKT/EWKT ('POINT(x y)', 'SRID=4326;POINT(x y)'): p.ej. un
+            # WKTElement asignado en el aggregator/seed antes del refresh
+            from shapely import wkt # type: ignore
+            point = wkt.loads(data.rsplit(';', 1)[-1]).centroid
+            return point.x, point.y
+    else:
+        data = bytes(data)
+    
+    endian = '<' if data[0] else '>'
+    geom_type, = struct.unpack_from(endian + 'I', data, 1)
+    offset = 9 if geom_type & _EWKB_SRID_FLAG else 5
+    
+    if geom_type & 0xFFFF != _WKB_POINT or len(data) < offset + 16:
+        # Shapely sólo se importa si aparece una geometría que no es POINT
+        from shapely import wkb # type: ignore
+        point = wkb.loads(data).centroid
+        return point.x, point.y
+    
+    return struct.unpack_from(endian + 'dd', data, offset)